@@ -0,0 +1,273 @@
+#!/bin/env python3
+
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#
+# Generates synthetic SBoMs, in the formats supported by
+# sbom-compliance-tool, for benchmarking.
+#
+# Usage: python3 benchmarks/generate.py -f cyclonedx-json -c 10000 -o sbom.json
+#
+# The number of distinct license expressions (--licenses) and the
+# average number of dependencies per component (--density) can be
+# set. The same arguments (and --seed) give the same SBoM.
+#
+
+import argparse
+import json
+import random
+from xml.sax.saxutils import escape
+
+FORMATS = ['cyclonedx-json', 'cyclonedx-xml', 'spdx-json', 'spdx-tag-value', 'native']
+
+FILE_SUFFIXES = {
+    'cyclonedx-json': '.cdx.json',
+    'cyclonedx-xml': '.cdx.xml',
+    'spdx-json': '.spdx.json',
+    'spdx-tag-value': '.spdx',
+    'native': '.json',
+}
+
+LICENSE_IDS = ['MIT', 'Apache-2.0', 'BSD-3-Clause', 'BSD-2-Clause', 'GPL-2.0-only', 'GPL-2.0-or-later',
+               'GPL-3.0-only', 'GPL-3.0-or-later', 'LGPL-2.1-only', 'LGPL-2.1-or-later', 'LGPL-3.0-or-later',
+               'MPL-2.0', 'Zlib', 'ISC', 'BSL-1.0', 'X11', 'curl', 'OpenSSL', 'EPL-2.0', 'Unlicense']
+
+def license_expressions(nr_licenses):
+    """Returns nr_licenses distinct license expressions: the license
+    ids first and then combinations of two of them"""
+    expressions = list(LICENSE_IDS)
+    for operator in ['OR', 'AND']:
+        for first in LICENSE_IDS:
+            for second in LICENSE_IDS:
+                if first != second:
+                    expressions.append(f'{first} {operator} {second}')
+    if nr_licenses > len(expressions):
+        raise Exception(f'At most {len(expressions)} distinct licenses can be generated')
+    return expressions[:max(1, nr_licenses)]
+
+class SyntheticSBoM():
+    """Components (name, version, license) where component 0 is the
+    top component, and the dependencies between them"""
+
+    def __init__(self, nr_components, nr_licenses=10, density=1.0, seed=0):
+        rand = random.Random(seed)
+        licenses = license_expressions(nr_licenses)
+        self.components = []
+        for index in range(nr_components):
+            self.components.append({
+                'ref': f'component-{index}',
+                'name': f'component-{index}',
+                'version': f'{index % 7}.{index % 13}.{index % 5}',
+                'license': licenses[rand.randrange(len(licenses))],
+            })
+
+        # all components are dependencies of the top component, or of a
+        # component depending on the top component, and some more
+        # dependencies are added to get the requested density
+        self.dependencies = {index: [] for index in range(nr_components)}
+        for index in range(1, nr_components):
+            self.dependencies[rand.randrange(index)].append(index)
+        nr_extra = max(0, int(nr_components * density) - (nr_components - 1))
+        for _ in range(nr_extra):
+            if nr_components < 3:
+                break
+            dependant = rand.randrange(1, nr_components - 1)
+            dependency = rand.randrange(dependant + 1, nr_components)
+            if dependency not in self.dependencies[dependant]:
+                self.dependencies[dependant].append(dependency)
+
+def _license_ids(expression):
+    # the CycloneDX reader does not read license expressions, each
+    # license in the expression is given as a license id instead
+    return [lic for lic in expression.split() if lic not in ['AND', 'OR']]
+
+def cyclonedx_json(sbom):
+    top = sbom.components[0]
+    doc = {
+        'bomFormat': 'CycloneDX',
+        'specVersion': '1.5',
+        'version': 1,
+        'metadata': {
+            'component': {
+                'type': 'application',
+                'bom-ref': top['ref'],
+                'name': top['name'],
+                'version': top['version'],
+                'licenses': [{'license': {'id': lic}} for lic in _license_ids(top['license'])],
+            },
+        },
+        'components': [],
+        'dependencies': [],
+    }
+    for component in sbom.components[1:]:
+        doc['components'].append({
+            'type': 'library',
+            'bom-ref': component['ref'],
+            'name': component['name'],
+            'version': component['version'],
+            'licenses': [{'license': {'id': lic}} for lic in _license_ids(component['license'])],
+        })
+    for index, dependencies in sbom.dependencies.items():
+        doc['dependencies'].append({
+            'ref': sbom.components[index]['ref'],
+            'dependsOn': [sbom.components[dep]['ref'] for dep in dependencies],
+        })
+    return json.dumps(doc, indent=2)
+
+def _cyclonedx_xml_component(component, component_type):
+    return (f'<component type="{component_type}" bom-ref="{escape(component["ref"])}">'
+            f'<name>{escape(component["name"])}</name>'
+            f'<version>{escape(component["version"])}</version>'
+            '<licenses>' + ''.join(f'<license><id>{escape(lic)}</id></license>' for lic in _license_ids(component['license'])) + '</licenses>'
+            '</component>')
+
+def cyclonedx_xml(sbom):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<bom xmlns="http://cyclonedx.org/schema/bom/1.5" version="1">',
+             f'  <metadata>{_cyclonedx_xml_component(sbom.components[0], "application")}</metadata>',
+             '  <components>']
+    for component in sbom.components[1:]:
+        lines.append('    ' + _cyclonedx_xml_component(component, 'library'))
+    lines.append('  </components>')
+    lines.append('  <dependencies>')
+    for index, dependencies in sbom.dependencies.items():
+        refs = ''.join(f'<dependency ref="{escape(sbom.components[dep]["ref"])}"/>' for dep in dependencies)
+        lines.append(f'    <dependency ref="{escape(sbom.components[index]["ref"])}">{refs}</dependency>')
+    lines.append('  </dependencies>')
+    lines.append('</bom>')
+    return '\n'.join(lines) + '\n'
+
+def _spdx_id(component):
+    return f'SPDXRef-{component["ref"]}'
+
+def spdx_json(sbom):
+    doc = {
+        'spdxVersion': 'SPDX-2.3',
+        'dataLicense': 'CC0-1.0',
+        'SPDXID': 'SPDXRef-DOCUMENT',
+        'name': 'synthetic',
+        'documentNamespace': 'https://example.com/synthetic',
+        'creationInfo': {
+            'created': '2025-01-01T00:00:00Z',
+            'creators': ['Tool: sbom-compliance-tool-benchmark'],
+        },
+        'packages': [],
+        'relationships': [{
+            'spdxElementId': 'SPDXRef-DOCUMENT',
+            'relationshipType': 'DESCRIBES',
+            'relatedSpdxElement': _spdx_id(sbom.components[0]),
+        }],
+    }
+    for component in sbom.components:
+        doc['packages'].append({
+            'SPDXID': _spdx_id(component),
+            'name': component['name'],
+            'versionInfo': component['version'],
+            'downloadLocation': 'NOASSERTION',
+            'filesAnalyzed': False,
+            'licenseConcluded': component['license'],
+            'licenseDeclared': 'NOASSERTION',
+        })
+    for index, dependencies in sbom.dependencies.items():
+        for dep in dependencies:
+            doc['relationships'].append({
+                'spdxElementId': _spdx_id(sbom.components[index]),
+                'relationshipType': 'DEPENDS_ON',
+                'relatedSpdxElement': _spdx_id(sbom.components[dep]),
+            })
+    return json.dumps(doc, indent=2)
+
+def spdx_tag_value(sbom):
+    lines = ['SPDXVersion: SPDX-2.3',
+             'DataLicense: CC0-1.0',
+             'SPDXID: SPDXRef-DOCUMENT',
+             'DocumentName: synthetic',
+             'DocumentNamespace: https://example.com/synthetic',
+             'Creator: Tool: sbom-compliance-tool-benchmark',
+             'Created: 2025-01-01T00:00:00Z',
+             '']
+    for component in sbom.components:
+        lines += [f'PackageName: {component["name"]}',
+                  f'SPDXID: {_spdx_id(component)}',
+                  f'PackageVersion: {component["version"]}',
+                  'PackageDownloadLocation: NOASSERTION',
+                  'FilesAnalyzed: false',
+                  f'PackageLicenseConcluded: {component["license"]}',
+                  'PackageLicenseDeclared: NOASSERTION',
+                  '']
+    lines.append(f'Relationship: SPDXRef-DOCUMENT DESCRIBES {_spdx_id(sbom.components[0])}')
+    for index, dependencies in sbom.dependencies.items():
+        for dep in dependencies:
+            lines.append(f'Relationship: {_spdx_id(sbom.components[index])} DEPENDS_ON {_spdx_id(sbom.components[dep])}')
+    return '\n'.join(lines) + '\n'
+
+def native(sbom):
+    packages = []
+    for index, component in enumerate(sbom.components):
+        packages.append({
+            'name': component['name'],
+            'version': component['version'],
+            'license': component['license'],
+            'dependencies': [{
+                'name': sbom.components[dep]['name'],
+                'version': sbom.components[dep]['version'],
+                'license': sbom.components[dep]['license'],
+                'usecase': 'library',
+                'modified': 'no',
+            } for dep in sbom.dependencies[index]],
+        })
+    doc = {
+        'meta': {
+            'format': 'sbom-compliance-tool',
+            'format_version': '0.1',
+            'original_format': 'synthetic',
+        },
+        'sbom': {
+            'packages': packages,
+        },
+    }
+    return json.dumps(doc, indent=2)
+
+
+WRITERS = {
+    'cyclonedx-json': cyclonedx_json,
+    'cyclonedx-xml': cyclonedx_xml,
+    'spdx-json': spdx_json,
+    'spdx-tag-value': spdx_tag_value,
+    'native': native,
+}
+
+def generate(sbom_format, nr_components, nr_licenses=10, density=1.0, seed=0):
+    """Returns the SBoM, as a string, in the given format"""
+    return WRITERS[sbom_format](SyntheticSBoM(nr_components, nr_licenses, density, seed))
+
+def get_parser():
+    parser = argparse.ArgumentParser(description='Generate synthetic SBoMs for benchmarking.')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='cyclonedx-json',
+                        help='SBoM format. Default: cyclonedx-json.')
+    parser.add_argument('-c', '--components', type=int, default=100,
+                        help='Number of components. Default: 100.')
+    parser.add_argument('-l', '--licenses', type=int, default=10,
+                        help='Number of distinct license expressions. Default: 10.')
+    parser.add_argument('-d', '--density', type=float, default=1.0,
+                        help='Average number of dependencies per component. Default: 1.0.')
+    parser.add_argument('-s', '--seed', type=int, default=0,
+                        help='Seed for the random generator. Default: 0.')
+    parser.add_argument('-o', '--output-file', type=str, default=None,
+                        help='File to write the SBoM to. Default: stdout.')
+    return parser
+
+def main():
+    args = get_parser().parse_args()
+    content = generate(args.format, args.components, args.licenses, args.density, args.seed)
+    if args.output_file:
+        with open(args.output_file, 'w') as fp:
+            fp.write(content)
+    else:
+        print(content, end='')
+
+
+if __name__ == '__main__':
+    main()
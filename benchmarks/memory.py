@@ -0,0 +1,96 @@
+#!/bin/env python3
+
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#
+# Measures the memory used by the normalized SBoM (compact records)
+# and by the same SBoM as dicts, for synthetic SBoMs (see generate.py).
+# The sizes are the sizes of the objects in the normalized SBoM, not
+# including memory used by the readers while reading.
+#
+# Usage: PYTHONPATH=. python3 benchmarks/memory.py [-s 100000] [-f spdx-json]
+#
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from generate import FILE_SUFFIXES
+from generate import generate
+
+from sbom_compliance_tool.compliance_tool import SBoMComplianceTool
+from sbom_compliance_tool.reader.sbom_reader import NormalizedRecord
+from sbom_compliance_tool.reader.sbom_reader import normalized_sbom_to_dict
+
+DEFAULT_FORMATS = ['cyclonedx-json', 'spdx-json']
+
+def deep_size(obj, seen=None):
+    """Size, in bytes, of obj and all objects it refers to. Shared
+    objects (e.g. interned strings) are counted once."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif isinstance(obj, NormalizedRecord):
+        size += sum(deep_size(getattr(obj, field), seen) for field in obj._fields)
+    return size
+
+def measure(file_path):
+    # the fast SPDX reader, spdx_tools is too slow for large SBoMs
+    compliance = SBoMComplianceTool({'fast_spdx': True})
+    normalized_sbom = compliance.from_sbom_file(file_path)
+    packages = normalized_sbom['sbom']['packages']
+
+    compact = deep_size(normalized_sbom)
+    # the same SBoM with a dict per package and dependency, as used
+    # before the compact records (but sharing the strings)
+    dicts = deep_size(normalized_sbom_to_dict(normalized_sbom))
+
+    return {
+        'packages': len(packages),
+        'dependencies': sum(len(package['dependencies']) for package in packages),
+        'compact': compact,
+        'dicts': dicts,
+        'ratio': dicts / compact,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure memory used by normalized SBoMs.')
+    parser.add_argument('-s', '--size', dest='sizes', type=int, action='append', default=[],
+                        help='Number of components, can be given several times. Default: 100000.')
+    parser.add_argument('-f', '--format', dest='formats', action='append', default=[],
+                        help=f'SBoM format, can be given several times. Default: {", ".join(DEFAULT_FORMATS)}.')
+    parser.add_argument('-d', '--density', type=float, default=2.0,
+                        help='Average number of dependencies per component. Default: 2.0.')
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes or [100000]:
+            for sbom_format in args.formats or DEFAULT_FORMATS:
+                file_path = os.path.join(tmp_dir, f'sbom-{size}{FILE_SUFFIXES[sbom_format]}')
+                with open(file_path, 'w') as fp:
+                    fp.write(generate(sbom_format, size, density=args.density))
+                result = {
+                    'format': sbom_format,
+                    'components': size,
+                }
+                result.update(measure(file_path))
+                results.append(result)
+                os.unlink(file_path)
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/bin/env python3
+
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#
+# Compares the time to normalize an SPDX JSON document with
+# spdx_tools (default) and with the fast SPDX reader (--fast-spdx).
+#
+# Usage: PYTHONPATH=. python3 benchmarks/spdx_reader.py [nr packages ...]
+#
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from sbom_compliance_tool.reader.spdx import SPDXSBoMReader
+
+LICENSES = ['MIT', 'Apache-2.0', 'BSD-3-Clause', 'GPL-2.0-only', 'LGPL-2.1-or-later', 'Zlib', 'MIT OR Apache-2.0']
+
+def spdx_document(nr_packages):
+    packages = []
+    relationships = [{
+        'spdxElementId': 'SPDXRef-DOCUMENT',
+        'relationshipType': 'DESCRIBES',
+        'relatedSpdxElement': 'SPDXRef-Package-0',
+    }]
+    for index in range(nr_packages):
+        packages.append({
+            'SPDXID': f'SPDXRef-Package-{index}',
+            'name': f'package-{index}',
+            'versionInfo': f'1.{index}',
+            'downloadLocation': 'NOASSERTION',
+            'licenseConcluded': LICENSES[index % len(LICENSES)],
+            'licenseDeclared': 'NOASSERTION',
+        })
+        if index:
+            relationships.append({
+                'spdxElementId': f'SPDXRef-Package-{index // 2}',
+                'relationshipType': 'DEPENDS_ON',
+                'relatedSpdxElement': f'SPDXRef-Package-{index}',
+            })
+    return {
+        'spdxVersion': 'SPDX-2.3',
+        'dataLicense': 'CC0-1.0',
+        'SPDXID': 'SPDXRef-DOCUMENT',
+        'name': 'benchmark',
+        'documentNamespace': 'https://example.com/benchmark',
+        'creationInfo': {
+            'created': '2025-01-01T00:00:00Z',
+            'creators': ['Tool: sbom-compliance-tool-benchmark'],
+        },
+        'packages': packages,
+        'relationships': relationships,
+    }
+
+def time_reader(file_path, options):
+    start = time.perf_counter()
+    normalized = SPDXSBoMReader(options).normalize_sbom_file(file_path)
+    return time.perf_counter() - start, normalized
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [100, 1000, 5000]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            file_path = os.path.join(tmp_dir, f'benchmark-{size}.spdx.json')
+            with open(file_path, 'w') as fp:
+                json.dump(spdx_document(size), fp)
+
+            spdx_tools_time, spdx_tools_sbom = time_reader(file_path, {})
+            fast_time, fast_sbom = time_reader(file_path, {'fast_spdx': True})
+            results.append({
+                'packages': size,
+                'spdx_tools': spdx_tools_time,
+                'fast': fast_time,
+                'speedup': spdx_tools_time / fast_time,
+                'identical': spdx_tools_sbom == fast_sbom,
+            })
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/bin/env python3
+
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#
+# Measures the startup time of sbom-compliance-tool, wall time and
+# the total import time (python -X importtime), for a few commands.
+#
+# Usage: PYTHONPATH=. python3 benchmarks/startup.py [baseline.json]
+#
+# With a baseline (earlier output from this script) the commands
+# taking more than 20% (and at least 0.1 seconds) longer than in the
+# baseline are reported and the script exits with 1.
+#
+
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+COMMANDS = {
+    'version': ['--version'],
+    'supported-resources': ['supported-resources'],
+    'verify': ['--no-cache', 'verify', 'example-data/normalized-project.json'],
+}
+
+# nr of runs per command, the fastest is used
+RUNS = 3
+
+REGRESSION_FACTOR = 1.2
+REGRESSION_MIN = 0.1
+
+# import time: self [us] | cumulative | imported package, indented
+# by two spaces per nesting level
+IMPORT_TIME_RE = re.compile(r'^import time:\s+\d+\s+\|\s+(\d+)\s+\|( +)\S')
+
+def run(args, import_time=False):
+    command = [sys.executable]
+    if import_time:
+        command += ['-X', 'importtime']
+    command += ['-m', 'sbom_compliance_tool'] + args
+    env = dict(os.environ)
+    env.setdefault('XDG_CACHE_HOME', tempfile.gettempdir())
+    start = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, env=env)
+    return time.perf_counter() - start, result.stderr
+
+def import_time(args):
+    """Returns the total import time, in seconds, of the top level
+    modules imported"""
+    _, stderr = run(args, import_time=True)
+    total = 0
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_RE.match(line)
+        # cumulative time of the top level imports only
+        if match and len(match.group(2)) == 1:
+            total += int(match.group(1))
+    return total / 1000000
+
+def measure():
+    results = {}
+    for name, args in COMMANDS.items():
+        results[name] = {
+            'wall': min(run(args)[0] for _ in range(RUNS)),
+            'imports': import_time(args),
+        }
+    return results
+
+def regressions(results, baseline):
+    found = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['wall']
+        after = result['wall']
+        if after > before * REGRESSION_FACTOR and after - before > REGRESSION_MIN:
+            found.append(f'{name}: {before:.3f}s -> {after:.3f}s')
+    return found
+
+
+def main():
+    results = measure()
+    print(json.dumps(results, indent=4))
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as fp:
+            baseline = json.load(fp)
+        found = regressions(results, baseline)
+        for regression in found:
+            print(f'Startup regression: {regression}', file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
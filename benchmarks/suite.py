@@ -0,0 +1,200 @@
+#!/bin/env python3
+
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#
+# Benchmark suite: generates synthetic SBoMs (see generate.py) in all
+# supported formats and sizes and times each stage separately:
+#
+# * detect - format detection
+# * normalize - reading and normalizing the SBoM
+# * compatibility - SBoMCompatibility.compatibility_report
+# * format_json, format_markdown - writing the report
+#
+# Usage: PYTHONPATH=. python3 benchmarks/suite.py [-s 100 -s 10000] [-f spdx-json] [-o results.json]
+#
+# The results are written as JSON. With --compare, the results from an
+# earlier run, the relative time for each stage is printed to stderr.
+#
+# Note: reading large SPDX documents (in particular tag-value) with
+# spdx_tools takes very long time, use --fast-spdx for the larger sizes.
+#
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from generate import FORMATS
+from generate import FILE_SUFFIXES
+from generate import generate
+
+from sbom_compliance_tool.compatibility import SBoMCompatibility
+from sbom_compliance_tool.compatibility import licomp_versions
+from sbom_compliance_tool.compliance_tool import SBoMComplianceTool
+from sbom_compliance_tool.config import sbom_compliance_tool_version
+from sbom_compliance_tool.format import FORMAT_JSON
+from sbom_compliance_tool.format import FORMAT_MARKDOWN
+from sbom_compliance_tool.format import SBoMReportFormatterFactory
+from sbom_compliance_tool.reader.detector import SBoMFormatDetector
+
+from licomp.interface import UseCase
+from licomp.interface import Provisioning
+from licomp.interface import Modification
+from licomp_toolkit.utils import resources_to_use
+
+DEFAULT_SIZES = [100, 10000, 100000]
+
+class Timer():
+
+    def __init__(self):
+        self.stages = {}
+
+    def time(self, stage, function, *args):
+        start = time.perf_counter()
+        start_cpu = time.process_time()
+        result = function(*args)
+        self.stages[stage] = {
+            'wall': time.perf_counter() - start,
+            'cpu': time.process_time() - start_cpu,
+        }
+        return result
+
+def write_report(output_format, report):
+    out = io.StringIO()
+    SBoMReportFormatterFactory.formatter(output_format).write(report['packages'], out)
+    return len(out.getvalue())
+
+def benchmark(file_path, reader_options, resources):
+    timer = Timer()
+    sbom_format, data = timer.time('detect', SBoMFormatDetector().detect_file, file_path)
+
+    compliance = SBoMComplianceTool(reader_options)
+    normalized_sbom = timer.time('normalize', compliance.from_sbom_file, file_path)
+    if not normalized_sbom:
+        raise Exception(f'Failed normalizing {file_path}')
+
+    compatibility = SBoMCompatibility()
+    report = timer.time('compatibility', compatibility.compatibility_report, normalized_sbom,
+                        UseCase.usecase_to_string(UseCase.LIBRARY),
+                        Provisioning.provisioning_to_string(Provisioning.BIN_DIST),
+                        Modification.modification_to_string(Modification.UNMODIFIED),
+                        resources)
+
+    json_size = timer.time('format_json', write_report, FORMAT_JSON, report)
+    markdown_size = timer.time('format_markdown', write_report, FORMAT_MARKDOWN, report)
+
+    return {
+        'detected_format': sbom_format,
+        'file_size': os.path.getsize(file_path),
+        'packages': len(normalized_sbom['sbom']['packages']),
+        'dependencies': sum(len(package['dependencies']) for package in normalized_sbom['sbom']['packages']),
+        'stages': timer.stages,
+        'counters': compatibility.cache_stats(),
+        'report_size': {
+            FORMAT_JSON: json_size,
+            FORMAT_MARKDOWN: markdown_size,
+        },
+    }
+
+def run(args):
+    # the resources, as names, the same way as the command line tool
+    resources, unsupported = resources_to_use(args)
+    if unsupported:
+        raise Exception(f'Resource(s) {", ".join(unsupported)} is/are not supported')
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            for sbom_format in args.formats:
+                file_path = os.path.join(tmp_dir, f'sbom-{size}{FILE_SUFFIXES[sbom_format]}')
+                with open(file_path, 'w') as fp:
+                    fp.write(generate(sbom_format, size, args.licenses, args.density, args.seed))
+                print(f'Benchmarking {sbom_format} with {size} components', file=sys.stderr)
+                result = {
+                    'format': sbom_format,
+                    'components': size,
+                }
+                result.update(benchmark(file_path, reader_options(args), resources))
+                results.append(result)
+                os.unlink(file_path)
+    return results
+
+def reader_options(args):
+    return {
+        'low_memory': args.low_memory,
+        'fast_spdx': args.fast_spdx,
+    }
+
+def compare(results, previous):
+    """Print the time, relative to the previous run, of each stage"""
+    previous_results = {(result['format'], result['components']): result for result in previous['results']}
+    for result in results:
+        before = previous_results.get((result['format'], result['components']))
+        if not before:
+            continue
+        for stage, timing in result['stages'].items():
+            if stage in before['stages'] and before['stages'][stage]['wall']:
+                ratio = timing['wall'] / before['stages'][stage]['wall']
+                print(f'{result["format"]:15} {result["components"]:>7} {stage:16} {ratio:6.2f}x', file=sys.stderr)
+
+def get_parser():
+    parser = argparse.ArgumentParser(description='Benchmark sbom-compliance-tool with synthetic SBoMs.')
+    parser.add_argument('-s', '--size', dest='sizes', type=int, action='append', default=[],
+                        help=f'Number of components, can be given several times. Default: {", ".join(str(s) for s in DEFAULT_SIZES)}.')
+    parser.add_argument('-f', '--format', dest='formats', choices=FORMATS, action='append', default=[],
+                        help='SBoM format, can be given several times. Default: all formats.')
+    parser.add_argument('-l', '--licenses', type=int, default=10,
+                        help='Number of distinct license expressions. Default: 10.')
+    parser.add_argument('-d', '--density', type=float, default=1.0,
+                        help='Average number of dependencies per component. Default: 1.0.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for the random generator. Default: 0.')
+    parser.add_argument('-r', '--resources', type=str, action='append', default=[],
+                        help='Licomp resource to use, as in sbom-compliance-tool. Default: the standard resources.')
+    parser.add_argument('--low-memory', action='store_true', default=False,
+                        help='Use the low memory readers.')
+    parser.add_argument('--fast-spdx', action='store_true', default=False,
+                        help='Use the fast SPDX reader.')
+    parser.add_argument('-o', '--output-file', type=str, default=None,
+                        help='File to write the results to. Default: stdout.')
+    parser.add_argument('--compare', type=str, default=None,
+                        help='Results from an earlier run to compare with.')
+    return parser
+
+def main():
+    args = get_parser().parse_args()
+    args.sizes = args.sizes or DEFAULT_SIZES
+    args.formats = args.formats or FORMATS
+
+    results = {
+        'version': sbom_compliance_tool_version,
+        'licomp': json.loads(licomp_versions()),
+        'settings': {
+            'licenses': args.licenses,
+            'density': args.density,
+            'seed': args.seed,
+            'reader_options': reader_options(args),
+            'resources': args.resources,
+        },
+        'results': run(args),
+    }
+
+    content = json.dumps(results, indent=4)
+    if args.output_file:
+        with open(args.output_file, 'w') as fp:
+            fp.write(content)
+    else:
+        print(content)
+
+    if args.compare:
+        with open(args.compare) as fp:
+            compare(results['results'], json.load(fp))
+
+
+if __name__ == '__main__':
+    main()
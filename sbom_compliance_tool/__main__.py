@@ -5,35 +5,155 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import argparse
+import contextlib
+import cProfile
+import glob
+import json
 import logging
+import os
 import sys
 
-from sbom_compliance_tool.compliance_tool import SBoMComplianceTool
 from sbom_compliance_tool.format import SBoMReportFormatterFactory
 from sbom_compliance_tool.format import FORMATS
 from sbom_compliance_tool.format import DEFAULT_FORMAT
-from sbom_compliance_tool.compatibility import SBoMCompatibility
-
-from licomp.interface import UseCase
-from licomp.interface import Provisioning
-from licomp.interface import Modification
-
-from licomp.return_codes import ReturnCodes
+from sbom_compliance_tool.format import FORMAT_MARKDOWN
+from sbom_compliance_tool.cache import DEFAULT_CACHE_SIZE
+from sbom_compliance_tool.store import COMPATIBILITY_STORE_FILE
+from sbom_compliance_tool.store import default_cache_dir
+from sbom_compliance_tool.sbom_cache import DEFAULT_NORMALIZED_CACHE_SIZE
+from sbom_compliance_tool.sbom_cache import NORMALIZED_CACHE_DIR
+from sbom_compliance_tool.server import DEFAULT_HOST
+from sbom_compliance_tool.server import DEFAULT_PORT
+from sbom_compliance_tool.timings import Timings
 
 from sbom_compliance_tool.config import long_description
 from sbom_compliance_tool.config import program_name
 from sbom_compliance_tool.config import sbom_compliance_tool_version
 from sbom_compliance_tool.config import epilog
 
-from licomp_toolkit.format import LicompToolkitFormatter
-from licomp_toolkit.toolkit import LicompToolkit
-from licomp_toolkit.utils import resources_to_use
+#
+# The readers and the compatibility checker (licomp, flame) take long time to import so they are imported in the
+# functions needing them, keeping e.g. --version fast.
+#
+
+# compatibility levels for --fail-on, least severe first (as in
+# compatibility.COMPATIBILITY_SEVERITY)
+FAIL_ON_LEVELS = ['yes', 'mixed', 'depends', 'unsupported', 'no', 'missing-license']
 
 def supported_resources(output_format):
+    from licomp.return_codes import ReturnCodes
+    from licomp_toolkit.format import LicompToolkitFormatter
+    from licomp_toolkit.toolkit import LicompToolkit
+
     licomp_toolkit = LicompToolkit()
     formatter = LicompToolkitFormatter.formatter(output_format)
     return formatter.format_licomp_resources(licomp_toolkit.licomp_resources_long()), ReturnCodes.LICOMP_OK.value, False
 
+def default_checks():
+    """Returns usecase, provisioning and modification used when checking
+    compatibility"""
+    from licomp.interface import UseCase
+    from licomp.interface import Provisioning
+    from licomp.interface import Modification
+
+    return (UseCase.usecase_to_string(UseCase.LIBRARY),
+            Provisioning.provisioning_to_string(Provisioning.BIN_DIST),
+            Modification.modification_to_string(Modification.UNMODIFIED))
+
+def license_text_lookup(args, timings):
+    from sbom_compliance_tool.license_texts import LICENSE_TEXT_STORE_FILE
+    from sbom_compliance_tool.license_texts import LicenseTextLookup
+
+    path = None
+    if not args.no_cache:
+        path = os.path.join(args.cache_dir, LICENSE_TEXT_STORE_FILE)
+    lookup = LicenseTextLookup(path, getattr(args, 'jobs', 1), timings)
+    if args.clear_cache and path:
+        logging.info(f'Clearing license text store: {path}')
+        lookup.clear()
+    return lookup
+
+def reader_options(args, timings):
+    return {
+        'low_memory': args.low_memory,
+        'fast_spdx': args.fast_spdx,
+        'dependency_graph': args.transitive,
+        'spdx_roots': args.spdx_roots,
+        'spdx_all_packages': args.spdx_all_packages,
+        # shared by all SBoMs read, identical license texts are looked up once
+        'license_texts': license_text_lookup(args, timings),
+    }
+
+def compatibility_store(args):
+    from sbom_compliance_tool.compatibility import licomp_versions
+    from sbom_compliance_tool.store import CompatibilityStore
+
+    if args.no_cache:
+        return None
+    store = CompatibilityStore(os.path.join(args.cache_dir, COMPATIBILITY_STORE_FILE), licomp_versions())
+    if args.clear_cache:
+        logging.info(f'Clearing compatibility store: {store.path}')
+        store.clear()
+    return store
+
+def normalized_sbom_cache(args):
+    from sbom_compliance_tool.license_texts import lookup_license_versions
+    from sbom_compliance_tool.sbom_cache import NormalizedSBoMCache
+
+    if args.no_cache or args.normalized_cache_size <= 0:
+        return None
+    # the extracted license texts are identified with lookup-license
+    version = f'{sbom_compliance_tool_version},{lookup_license_versions()}'
+    cache = NormalizedSBoMCache(os.path.join(args.cache_dir, NORMALIZED_CACHE_DIR),
+                                version,
+                                args.normalized_cache_size * 1024 * 1024)
+    if args.clear_cache:
+        logging.info(f'Clearing normalized SBoM cache: {cache.directory}')
+        cache.clear()
+    return cache
+
+def compatibility_matrix(args):
+    if not args.matrix:
+        return None
+    from sbom_compliance_tool.compatibility import licomp_versions
+    from sbom_compliance_tool.matrix import CompatibilityMatrix
+
+    matrix = CompatibilityMatrix.load(args.matrix)
+    if matrix.version != licomp_versions():
+        logging.warning(f'Compatibility matrix {args.matrix} built with other resource versions, not using it')
+        return None
+    return matrix
+
+def build_matrix(args, compliance, compatibility, resources):
+    """Build a compatibility matrix for the given licenses and the
+    licenses in the SBoMs in the corpus"""
+    from licomp.interface import UseCase
+
+    licenses = list(args.licenses)
+    if args.corpus:
+        sbom_files, batch = expand_sbom_files_or_fail([args.corpus])
+        if sbom_files is None:
+            return 1
+        for sbom_file in sbom_files:
+            try:
+                normalized_sbom = normalize_sbom_file(compliance, sbom_file)
+            except Exception as e:
+                logging.warning(f'Failed reading: {sbom_file}. Exception: {e}')
+                continue
+            if normalized_sbom:
+                licenses += sorted(compatibility.sbom_licenses(normalized_sbom))
+    if not licenses:
+        logging.error('No licenses to build the compatibility matrix for')
+        return 1
+
+    usecase, provisioning, modified = default_checks()
+    usecases = args.usecases or [UseCase.usecase_to_string(value) for value in UseCase]
+    provisionings = args.provisionings or [provisioning]
+    matrix = compatibility.build_matrix(licenses, usecases, provisionings, resources)
+    matrix.save(args.output_file)
+    logging.info(f'Compatibility matrix with {len(matrix.licenses)} licenses written to {args.output_file}')
+    return 0
+
 def main():
 
     args = get_args()
@@ -47,46 +167,264 @@ def main():
         logging.basicConfig(level=logging.DEBUG)
     logging.info("SBoM Compliance Tool")
 
+    timings = Timings()
+    profiler = None
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        return run(args, timings)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            logging.info(f'Profile written to {args.profile}')
+        if args.timings or args.timings_file:
+            write_timings(args, timings)
+
+def write_timings(args, timings):
+    content = json.dumps(timings.report(), indent=4)
+    if args.timings_file:
+        with open(args.timings_file, 'w') as fp:
+            fp.write(content)
+            fp.write('\n')
+    else:
+        print(content, file=sys.stderr)
+
+def run(args, timings):
     if args.which == 'supported_resources':
         resources, status, errs = supported_resources('text')
         print(resources)
         sys.exit(0)
 
-    # Check which resources to use
-    resources, unsupported = resources_to_use(args)
-    if unsupported:
-        logging.warning(f'Resource(s) {", ".join(unsupported)} is/are not supported')
-        sys.exit(ReturnCodes.LICOMP_UNSUPPORTED_RESOURCE.value)
-
-    # Read SBoM
-    compliance = SBoMComplianceTool()
-    logging.info(f'Tool: {compliance}')
-
-    logging.info(f'Reading: {args.sbom_file}')
-    normalized_sbom = compliance.from_sbom_file(args.sbom_file)
-
+    with timings.stage('setup'):
+        from licomp.return_codes import ReturnCodes
+        from licomp_toolkit.utils import resources_to_use
+        from sbom_compliance_tool.compliance_tool import SBoMComplianceTool
+        from sbom_compliance_tool.compatibility import SBoMCompatibility
+
+        # Check which resources to use
+        resources, unsupported = resources_to_use(args)
+        if unsupported:
+            logging.warning(f'Resource(s) {", ".join(unsupported)} is/are not supported')
+            sys.exit(ReturnCodes.LICOMP_UNSUPPORTED_RESOURCE.value)
+
+        options = reader_options(args, timings)
+        compliance = SBoMComplianceTool(options, timings, normalized_sbom_cache(args))
+        logging.info(f'Tool: {compliance}')
+        compatibility = SBoMCompatibility(args.cache_size, compatibility_store(args), timings, compatibility_matrix(args), args.tiered)
+    try:
+        return run_command(args, compliance, compatibility, resources, timings)
+    finally:
+        timings.set_counters('compatibility', compatibility.cache_stats())
+        timings.set_counters('license_texts', options['license_texts'].stats())
+        options['license_texts'].close()
+        compatibility.close()
+        if compliance.sbom_cache:
+            timings.set_counters('normalized_sbom_cache', compliance.sbom_cache.stats())
+
+def run_command(args, compliance, compatibility, resources, timings):
+
+    if args.which == 'serve':
+        from sbom_compliance_tool.server import SBoMComplianceServer
+        usecase, provisioning, modified = default_checks()
+        server = SBoMComplianceServer(compliance, compatibility, resources, usecase, provisioning, modified)
+        server.serve(args.host, args.port)
+        return 0
+
+    if args.which == 'build_matrix':
+        return build_matrix(args, compliance, compatibility, resources)
+
+    if args.output_dir and args.output_format.lower() != FORMAT_MARKDOWN:
+        logging.error(f'--output-dir is only supported for the {FORMAT_MARKDOWN} format')
+        return 1
+
+    sbom_files, batch = expand_sbom_files_or_fail(args.sbom_files)
+    if sbom_files is None:
+        return 1
+    if batch:
+        if args.baseline:
+            logging.warning('Baseline is only used when verifying one SBoM, ignoring it')
+        if args.output_dir:
+            logging.warning('Output directory is only used when verifying one SBoM, ignoring it')
+        if args.fail_on:
+            logging.warning('Fail on is only used when verifying one SBoM, ignoring it')
+        return verify_batch(compliance, compatibility, sbom_files, resources, args)
+
+    sbom_file = sbom_files[0]
+    baseline = None
+    if args.baseline and not args.fail_on:
+        from sbom_compliance_tool.baseline import ReportBaseline
+        try:
+            baseline = ReportBaseline.from_file(args.baseline)
+        except Exception as e:
+            logging.error(f'{e}')
+            return 1
+
+    normalized_sbom = normalize_sbom_file(compliance, sbom_file)
     if not normalized_sbom:
-        logging.warning(f'Failed normalizing: {args.sbom_file}')
         sys.exit(1)
 
-    # Check compatibility for SBoM
-    logging.info(f'Check compatibility: {args.sbom_file}')
-    compatibility = SBoMCompatibility()
-    report = compatibility.compatibility_report(normalized_sbom,
-                                                UseCase.usecase_to_string(UseCase.LIBRARY),
-                                                Provisioning.provisioning_to_string(Provisioning.BIN_DIST),
-                                                Modification.modification_to_string(Modification.UNMODIFIED),
-                                                resources)
-
-    # Format the compatibility report
+    if args.fail_on:
+        return policy_gate(compatibility, normalized_sbom, resources, args, timings)
+
     formatter = SBoMReportFormatterFactory.formatter(args.output_format)
-    logging.debug(f'Report: {report}')
 
-    # Print the report
-    formatted_report = formatter.format(report)
+    # Check compatibility for SBoM and write the report, package by package
+    logging.info(f'Check compatibility: {sbom_file}')
+    packages = timings.iterate('compatibility', report_packages(compatibility, normalized_sbom, resources, args, baseline))
+    if args.output_dir:
+        with timings.stage('format'):
+            index_path = formatter.write_sharded(packages, args.output_dir, args.shard_size)
+        logging.info(f'Report written to {args.output_dir}, index: {index_path}')
+    else:
+        with open_output(args) as out, timings.stage('format'):
+            formatter.write(packages, out)
+    logging.info(f'Compatibility cache: {compatibility.cache_stats()}')
+
+    if baseline:
+        write_changes(args, baseline.changes(normalized_sbom))
+
+def write_changes(args, changes):
+    """Write the changes since the baseline to the file args.changes,
+    or to stderr if not given"""
+    if not args.changes:
+        print(json.dumps(changes, indent=4), file=sys.stderr)
+        return
+    with open(args.changes, 'w') as fp:
+        fp.write(json.dumps(changes, indent=4))
+        fp.write('\n')
+    logging.info(f'Changes since baseline written to {args.changes}')
+
+def policy_gate(compatibility, normalized_sbom, resources, args, timings):
+    """Check the SBoM until a dependency is at least as bad as
+    args.fail_on, write the (minimal) report as JSON. Returns 1 if the
+    check failed."""
+    usecase, provisioning, modified = default_checks()
+    with timings.stage('compatibility'):
+        report = compatibility.policy_gate(normalized_sbom, usecase, provisioning, modified, args.fail_on, resources)
+    with open_output(args) as out:
+        out.write(json.dumps(report, indent=4))
+        out.write('\n')
+    if report['status'] == 'failed':
+        return 1
+    return 0
+
+def open_output(args):
+    if args.output_file:
+        return open(args.output_file, 'w')
+    return contextlib.nullcontext(sys.stdout)
+
+def expand_sbom_files(paths):
+    """Expand directories and glob patterns to files. Returns the files,
+    whether or not more than one SBoM was asked for and the directories
+    and glob patterns with no files."""
+    sbom_files = []
+    empty = []
+    batch = len(paths) > 1
+    for path in paths:
+        if os.path.isdir(path):
+            batch = True
+            path_files = []
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                path_files += [os.path.join(root, f) for f in sorted(files)]
+        elif not os.path.exists(path) and glob.has_magic(path):
+            batch = True
+            path_files = sorted(f for f in glob.glob(path, recursive=True) if os.path.isfile(f))
+        else:
+            path_files = [path]
+        if not path_files:
+            empty.append(path)
+        sbom_files += path_files
+    return sbom_files, batch, empty
+
+def expand_sbom_files_or_fail(paths):
+    """As expand_sbom_files, but logs an error and returns None for the
+    files if a directory or glob pattern has no files"""
+    sbom_files, batch, empty = expand_sbom_files(paths)
+    for path in empty:
+        logging.error(f'No SBoM files found in: {path}')
+    if empty:
+        return None, batch
+    return sbom_files, batch
+
+def normalize_sbom_file(compliance, sbom_file):
+    logging.info(f'Reading: {sbom_file}')
+    normalized_sbom = compliance.from_sbom_file(sbom_file)
 
-    print(formatted_report)
+    if not normalized_sbom:
+        logging.warning(f'Failed normalizing: {sbom_file}')
+    return normalized_sbom
+
+def report_packages(compatibility, normalized_sbom, resources, args, baseline=None):
+    usecase, provisioning, modified = default_checks()
+    return compatibility.compatibility_report_packages(normalized_sbom,
+                                                       usecase,
+                                                       provisioning,
+                                                       modified,
+                                                       resources,
+                                                       args.jobs,
+                                                       baseline)
+
+def verify_sbom_file(compliance, compatibility, sbom_file, resources, args):
+    normalized_sbom = normalize_sbom_file(compliance, sbom_file)
+    if not normalized_sbom:
+        return None
 
+    # Check compatibility for SBoM
+    logging.info(f'Check compatibility: {sbom_file}')
+    report = {
+        'packages': list(compatibility.timings.iterate('compatibility', report_packages(compatibility, normalized_sbom, resources, args))),
+    }
+    logging.info(f'Compatibility cache: {compatibility.cache_stats()}')
+    return report
+
+def verify_batch(compliance, compatibility, sbom_files, resources, args):
+    """Verify several SBoMs, writing one JSON object per SBoM (JSON
+    Lines) and a summary to stderr."""
+    summary = {
+        'files': len(sbom_files),
+        'ok': 0,
+        'failed': 0,
+        'compatibility': {},
+    }
+    with open_output(args) as out:
+        for sbom_file in sbom_files:
+            result = {
+                'file': sbom_file,
+            }
+            try:
+                report = verify_sbom_file(compliance, compatibility, sbom_file, resources, args)
+            except Exception as e:
+                logging.warning(f'Failed verifying: {sbom_file}. Exception: {e}')
+                report = None
+
+            if report:
+                compat = compatibility.sbom_compatibility(report)
+                result['status'] = 'ok'
+                result['compatibility'] = compat
+                result['report'] = report
+                summary['ok'] += 1
+                summary['compatibility'][compat] = summary['compatibility'].get(compat, 0) + 1
+            else:
+                result['status'] = 'failed'
+                summary['failed'] += 1
+            with compatibility.timings.stage('format'):
+                out.write(json.dumps(result))
+                out.write('\n')
+                out.flush()
+
+    print(json.dumps(summary, indent=4), file=sys.stderr)
+    if summary['failed']:
+        return 1
+    return 0
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f'must be 0 or more, not {value}')
+    return number
 
 def get_parser():
     parser = argparse.ArgumentParser(prog=program_name,
@@ -120,6 +458,83 @@ def get_parser():
                         help='use specified licomp resource. For a list use the commands \'supported-resources\'. Use \'all\' to use all',
                         default=[])
 
+    parser.add_argument('--cache-size',
+                        type=int,
+                        help=f'Maximum number of compatibility verdicts to keep in memory. Default: {DEFAULT_CACHE_SIZE}.',
+                        default=DEFAULT_CACHE_SIZE)
+
+    parser.add_argument('--cache-dir',
+                        type=str,
+                        help=f'Directory for the persistent caches. Default: {default_cache_dir()}.',
+                        default=default_cache_dir())
+
+    parser.add_argument('--no-cache',
+                        action='store_true',
+                        help='Do not read or write the persistent caches (compatibility verdicts, license texts and normalized SBoMs).',
+                        default=False)
+
+    parser.add_argument('--clear-cache',
+                        action='store_true',
+                        help='Remove all entries in the persistent caches before verifying.',
+                        default=False)
+
+    parser.add_argument('--timings',
+                        action='store_true',
+                        help='Output wall and CPU time per stage, and counters (e.g. licomp calls and cache hits), as JSON to stderr.',
+                        default=False)
+
+    parser.add_argument('--timings-file',
+                        type=str,
+                        help='Write the timings (see --timings) to this file instead of stderr.',
+                        default=None)
+
+    parser.add_argument('--profile',
+                        type=str,
+                        help='Profile the run, with cProfile, and write the profile to this file.',
+                        default=None)
+
+    parser.add_argument('--low-memory',
+                        action='store_true',
+                        help='Read SBoMs as a stream, where supported (CycloneDX), to keep memory usage low.',
+                        default=False)
+
+    parser.add_argument('--fast-spdx',
+                        action='store_true',
+                        help='Read SPDX JSON and tag-value with a fast reader, only reading what is needed and without validating the document.',
+                        default=False)
+
+    parser.add_argument('--normalized-cache-size',
+                        type=int,
+                        help=f'Maximum size, in MB, of the cache with normalized SBoMs (in the cache directory). SBoM files already normalized are read from the cache. 0 disables the cache. Default: {DEFAULT_NORMALIZED_CACHE_SIZE}.',
+                        default=DEFAULT_NORMALIZED_CACHE_SIZE)
+
+    parser.add_argument('--matrix',
+                        type=str,
+                        help='Compatibility matrix (see build-matrix) to look up verdicts in before using licomp. Only the verdicts, not the details, are in the matrix.',
+                        default=None)
+
+    parser.add_argument('--tiered',
+                        action='store_true',
+                        help='Check compatibility with one resource at a time, cheapest (measured) first, and only use the next resource if the verdict is unsupported or depends. The report says which resource decided each verdict.',
+                        default=False)
+
+    parser.add_argument('--spdx-root',
+                        type=str,
+                        dest='spdx_roots',
+                        action='append',
+                        help='SPDXID of an element to report on, with everything reachable from it as dependencies. Can be given several times. Default: the elements the SPDX document describes.',
+                        default=[])
+
+    parser.add_argument('--spdx-all-packages',
+                        action='store_true',
+                        help='Report on every package in SPDX documents, with its direct relationships as dependencies, instead of on the root elements.',
+                        default=False)
+
+    parser.add_argument('--transitive',
+                        action='store_true',
+                        help='Read the dependency graph (CycloneDX dependencies, SPDX relationships) and add the transitive compatibility, the worst compatibility in the dependency tree, of each package.',
+                        default=False)
+
     subparsers = parser.add_subparsers(help='Sub commands')
     parser_v = subparsers.add_parser('verify',
                                      help='Verify license compatibility between the licenses for packages in an SBoM.')
@@ -129,7 +544,95 @@ def get_parser():
                                       help='List all supported Licomp resources')
     parser_sr.set_defaults(which="supported_resources")
 
-    parser_v.add_argument("sbom_file")
+    parser_s = subparsers.add_parser('serve',
+                                     help='Run a local HTTP server verifying SBoMs posted to /verify.')
+    parser_s.set_defaults(which="serve")
+
+    parser_m = subparsers.add_parser('build-matrix',
+                                     help='Build a compatibility matrix, with the verdicts for all combinations of a list of licenses, for use with --matrix.')
+    parser_m.set_defaults(which="build_matrix")
+
+    parser_m.add_argument('-l', '--license',
+                          type=str,
+                          dest='licenses',
+                          action='append',
+                          help='License to add to the matrix, can be given several times.',
+                          default=[])
+
+    parser_m.add_argument('--corpus',
+                          type=str,
+                          help='Directory (or glob pattern) with SBoMs, the licenses in them are added to the matrix.',
+                          default=None)
+
+    parser_m.add_argument('--usecase',
+                          type=str,
+                          dest='usecases',
+                          action='append',
+                          help='Usecase to add to the matrix, can be given several times. Default: all usecases.',
+                          default=[])
+
+    parser_m.add_argument('--provisioning',
+                          type=str,
+                          dest='provisionings',
+                          action='append',
+                          help='Provisioning to add to the matrix, can be given several times. Default: the provisioning used when verifying.',
+                          default=[])
+
+    parser_m.add_argument('-o', '--output-file',
+                          type=str,
+                          required=True,
+                          help='File to write the matrix to.')
+
+    parser_s.add_argument('--host',
+                          type=str,
+                          help=f'Address to listen on. Default: {DEFAULT_HOST}.',
+                          default=DEFAULT_HOST)
+
+    parser_s.add_argument('--port',
+                          type=int,
+                          help=f'Port to listen on. Default: {DEFAULT_PORT}.',
+                          default=DEFAULT_PORT)
+
+    parser_v.add_argument('-j', '--jobs',
+                          type=int,
+                          help='Number of processes to use when checking packages for compatibility and identifying license texts. Default: 1.',
+                          default=1)
+
+    parser_v.add_argument('-o', '--output-file',
+                          type=str,
+                          help='Write the report to this file instead of stdout.',
+                          default=None)
+
+    parser_v.add_argument('--output-dir',
+                          type=str,
+                          help=f'Write the report ({FORMAT_MARKDOWN} only) to this directory, one file per package and an index file with the summary.',
+                          default=None)
+
+    parser_v.add_argument('--shard-size',
+                          type=non_negative_int,
+                          help='With --output-dir, split packages with more dependencies than this in several files. Default: 0 (one file per package).',
+                          default=0)
+
+    parser_v.add_argument('--fail-on',
+                          type=str,
+                          choices=FAIL_ON_LEVELS,
+                          help=f'Only check if any dependency has this compatibility, or worse ({", ".join(FAIL_ON_LEVELS)}). Stops at the first one found, writes a short JSON report with the offending dependencies and exits with 1.',
+                          default=None)
+
+    parser_v.add_argument('--baseline',
+                          type=str,
+                          help='Previous JSON report for the SBoM. Verdicts for unchanged dependencies are reused.',
+                          default=None)
+
+    parser_v.add_argument('--changes',
+                          type=str,
+                          help='With --baseline, write a summary (JSON) of the changes since the baseline to this file instead of to stderr.',
+                          default=None)
+
+    parser_v.add_argument("sbom_files",
+                          nargs='+',
+                          metavar='sbom_file',
+                          help='SBoM file(s), directories or glob patterns. With more than one SBoM the reports are printed as JSON Lines, one line per SBoM, with a summary on stderr.')
 
     return parser
 
@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import logging
+
+MISSING_LICENSE = 'missing-license'
+
+class ReportBaseline():
+    """A previous (JSON) compatibility report, used to reuse the
+    verdicts for dependencies that have not changed.
+
+    A dependency is unchanged if the package it belongs to (name,
+    version and license) and the dependency itself (name, version,
+    license and usecase) are the same as in the baseline. Verdicts are
+    only reused if they were made with the same resources and
+    provisioning.
+    """
+
+    def __init__(self, report, path=None):
+        self.path = path
+        self.reused = 0
+        self.evaluated = 0
+        self._verdicts = {}
+        self._dependencies = {}
+        self._packages = set()
+        for package in report.get('packages', []):
+            package_key = self._package_key(package)
+            self._packages.add(package['name'])
+            verdicts = self._verdicts.setdefault(package_key, {})
+            for dep in package.get('dependencies', []):
+                verdicts[self._dependency_key(dep)] = dep.get('compatibility_details')
+                self._add_dependency(self._dependencies, package, dep)
+
+    @staticmethod
+    def from_file(path):
+        try:
+            with open(path) as fp:
+                report = json.load(fp)
+        except (OSError, ValueError) as e:
+            raise Exception(f'Failed reading baseline {path}: {e}')
+        if not isinstance(report, dict) or not isinstance(report.get('packages'), list):
+            raise Exception(f'Baseline {path} is not a JSON compatibility report')
+        try:
+            return ReportBaseline(report, path)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise Exception(f'Baseline {path} is not a JSON compatibility report, missing or invalid: {e}')
+
+    def _package_key(self, package):
+        return (package['name'], package['version'], package['license'])
+
+    def _dependency_key(self, dep):
+        return (dep['name'], dep['version'], dep['license'], dep.get('usecase'))
+
+    def _add_dependency(self, dependencies, package, dep):
+        key = (package['name'], dep['name'])
+        dependencies.setdefault(key, []).append((dep['version'], dep['license'], dep.get('usecase')))
+
+    def _reusable(self, details, resources, provisioning):
+        if not details:
+            return False
+        if details.get('compatibility') == MISSING_LICENSE:
+            return True
+        return (sorted(details.get('resources', [])) == sorted(resources) and
+                details.get('provisioning') == provisioning)
+
+    def package_verdicts(self, package, resources, provisioning):
+        """Returns the baseline verdicts that can be reused for a
+        package, as a dict with (inbound license, usecase) as key"""
+        verdicts = {}
+        baseline_verdicts = self._verdicts.get(self._package_key(package), {})
+        for dep in package['dependencies']:
+            details = baseline_verdicts.get(self._dependency_key(dep))
+            if self._reusable(details, resources, provisioning):
+                verdicts[(dep['license'], dep.get('usecase'))] = details
+
+        for dep in package['dependencies']:
+            if (dep['license'], dep.get('usecase')) in verdicts:
+                self.reused += 1
+            else:
+                self.evaluated += 1
+        logging.debug(f'{package["name"]}: reusing {len(verdicts)} verdict(s) from baseline')
+        return verdicts
+
+    def changes(self, sbom):
+        """Summarize the changes in the normalized SBoM compared to the
+        baseline"""
+        dependencies = {}
+        packages = set()
+        for package in sbom['sbom']['packages']:
+            packages.add(package['name'])
+            for dep in package['dependencies']:
+                self._add_dependency(dependencies, package, dep)
+
+        added = []
+        removed = []
+        changed = []
+        unchanged = 0
+        for key in sorted(dependencies.keys() | self._dependencies.keys()):
+            before = sorted(self._dependencies.get(key, []), key=str)
+            after = sorted(dependencies.get(key, []), key=str)
+            entry = {
+                'package': key[0],
+                'dependency': key[1],
+            }
+            if not before:
+                added.append(entry)
+            elif not after:
+                removed.append(entry)
+            elif before != after:
+                entry['before'] = [self._dependency_info(dep) for dep in before]
+                entry['after'] = [self._dependency_info(dep) for dep in after]
+                changed.append(entry)
+            else:
+                unchanged += 1
+
+        return {
+            'baseline': self.path,
+            'packages': {
+                'added': sorted(packages - self._packages),
+                'removed': sorted(self._packages - packages),
+            },
+            'dependencies': {
+                'added': added,
+                'removed': removed,
+                'changed': changed,
+                'unchanged': unchanged,
+            },
+            'verdicts': {
+                'reused': self.reused,
+                'evaluated': self.evaluated,
+            },
+        }
+
+    def _dependency_info(self, dep):
+        version, lic, usecase = dep
+        return {
+            'version': version,
+            'license': lic,
+            'usecase': usecase,
+        }
@@ -2,88 +2,667 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import json
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 from licomp_toolkit.toolkit import LicompToolkit
 from licomp_toolkit.toolkit import ExpressionExpressionChecker
 from flame.license_db import FossLicenses
 
-class SBoMCompatibility():
+from sbom_compliance_tool.cache import CompatibilityCache
+from sbom_compliance_tool.cache import DEFAULT_CACHE_SIZE
+from sbom_compliance_tool.graph import DependencyGraph
+from sbom_compliance_tool.matrix import CompatibilityMatrix
+from sbom_compliance_tool.store import CompatibilityStore
+from sbom_compliance_tool.timings import Timings
+
+# Severity of the compatibility verdicts, the most severe verdict of
+# the dependencies is the verdict of a package
+COMPATIBILITY_SEVERITY = {
+    None: 0,
+    'yes': 1,
+    'mixed': 2,
+    'depends': 3,
+    'unsupported': 4,
+    'no': 5,
+    'missing-license': 6,
+}
+
+# With tiered evaluation, verdicts for which the next resource is
+# consulted
+UNDECIDED_VERDICTS = ['unsupported', 'depends']
+# Added, with the order of the resources, to the resources in the
+# cache key for tiered verdicts
+TIERED_KEY = 'tiered'
+# License pair, and nr of checks, used to measure the cost of resources
+PROBE_OUTBOUND = 'MIT'
+PROBE_INBOUND = 'BSD-3-Clause'
+PROBES = 3
+
+# SBoMCompatibility instance in a worker process, see _init_worker
+_worker_compatibility = None
+
+def licomp_versions():
+    return json.dumps(LicompToolkit().versions(), sort_keys=True)
+
+def _init_worker(cache_size, store_path, store_version, matrix_path, tiered, tiers):
+    global _worker_compatibility
+    store = None
+    if store_path:
+        store = CompatibilityStore(store_path, store_version)
+    matrix = None
+    if matrix_path:
+        matrix = CompatibilityMatrix.load(matrix_path)
+    # the workers use the resource tiers measured by the parent process
+    _worker_compatibility = SBoMCompatibility(cache_size, store, matrix=matrix, tiered=tiered, tiers=tiers)
+
+def _worker_package_report(package_args):
+    # the counters are sent back so the parent can add them to its own
+    report = _worker_compatibility._package_compatibility_report(*package_args)
+    return report, os.getpid(), _worker_compatibility._counters()
+
+def _add_counters(stats, counters):
+    for key, value in counters.items():
+        if isinstance(value, dict):
+            _add_counters(stats.setdefault(key, {}), value)
+        else:
+            stats[key] = stats.get(key, 0) + value
+
+class PendingCheck():
+    """A compatibility check in progress. Threads needing the same
+    verdict wait for it instead of checking it again."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self.compat = None
+        self.error = None
+
+    def done(self, compat=None, error=None):
+        self.compat = compat
+        self.error = error
+        self._done.set()
+
+    def wait(self):
+        self._done.wait()
+        if self.error:
+            raise self.error
+        return self.compat
+
+class ResourceLatencies():
+    """Latency of the checks made with one resource at a time"""
 
     def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+
+    def add(self, resource, latency):
+        with self._lock:
+            stats = self.latencies.setdefault(resource, {'count': 0, 'total': 0.0, 'min': latency, 'max': latency})
+            stats['count'] += 1
+            stats['total'] += latency
+            stats['min'] = min(stats['min'], latency)
+            stats['max'] = max(stats['max'], latency)
+
+    def min(self, resource):
+        with self._lock:
+            return self.latencies[resource]['min']
+
+    def stats(self):
+        with self._lock:
+            return {resource: dict(stats, mean=stats['total'] / stats['count']) for resource, stats in self.latencies.items()}
+
+class SBoMCompatibility():
+    """Checks the compatibility of the packages in normalized SBoMs.
+
+    With tiered set, each check is made with one resource at a time,
+    the cheapest (measured when first used, unless given in tiers)
+    first. The next resource is only consulted if the verdict is one
+    of UNDECIDED_VERDICTS.
+    """
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, store=None, timings=None, matrix=None, tiered=False, tiers=None):
         self.flame = FossLicenses()
+        self.timings = timings or Timings()
+        self.cache = CompatibilityCache(cache_size)
+        self.store = store
+        # CompatibilityMatrix, consulted before the store and licomp
+        self.matrix = matrix
+        self.tiered = tiered
+        self.resource_latencies = ResourceLatencies()
+        # the resources, cheapest first, per (sorted) tuple of resources
+        self._tiers = dict(tiers or {})
+        # nr of verdicts decided by each resource (None if undecided)
+        self.tier_decisions = {}
+        self._tiers_lock = threading.Lock()
+        self.licomp_calls = 0
+        self.flame_calls = 0
+        self._identified = {}
+        self._identified_lock = threading.Lock()
+        # checks in progress (PendingCheck), per cache key
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._compat_checker = None
+        # worker processes (and their initargs), kept until close()
+        self._executor = None
+        # the latest counters from each worker process, per pid
+        self._worker_counters = {}
+        self._executor_args = None
+        # flame and licomp are not known to be thread safe
+        self._lock = threading.Lock()
 
     def update_compat(self, current, new):
-        _map = {
-            None: 0,
-            'yes': 1,
-            'mixed': 2,
-            'depends': 3,
-            'unsupported': 4,
-            'no': 5,
-            'missing-license': 6,
-        }
-        p_current = _map[current]
-        p_new = _map[new]
+        p_current = COMPATIBILITY_SEVERITY[current]
+        p_new = COMPATIBILITY_SEVERITY[new]
         if p_new > p_current:
             return new
         return current
 
-    def _identify_license(self, lic):
+    def sbom_compatibility(self, report):
+        """Summarize the compatibility of all packages in a report"""
+        compat = None
+        for package in report['packages']:
+            compat = self.update_compat(compat, package['compatibility'])
+        return compat
+
+    def _flame_identify_license(self, lic):
         try:
-            return self.flame.expression_license(lic, update_dual=False)['identified_license']
+            with self._lock, self.timings.stage('flame'):
+                self.flame_calls += 1
+                return self.flame.expression_license(lic, update_dual=False)['identified_license']
         except Exception:
             logging.debug('Could not identify license using flame, returning input.')
             return lic
 
-    def _package_compatibility_report(self, package, usecase, provisioning, modified, resources):
+    def _identify_license(self, lic):
+        # each license is identified once, also when several threads ask for it
+        with self._identified_lock:
+            if lic not in self._identified:
+                self._identified[lic] = self._flame_identify_license(lic)
+            return self._identified[lic]
+
+    def sbom_licenses(self, sbom):
+        """The distinct license expressions in the normalized SBoM"""
+        licenses = set()
+        for package in sbom['sbom']['packages']:
+            licenses.add(package['license'])
+            for dep in package['dependencies']:
+                if dep['license']:
+                    licenses.add(dep['license'])
+        return licenses
+
+    def identify_licenses(self, sbom):
+        """Identify, once, each distinct license expression in the
+        normalized SBoM"""
+        with self._identified_lock:
+            for lic in sorted(self.sbom_licenses(sbom) - self._identified.keys()):
+                self._identified[lic] = self._flame_identify_license(lic)
+
+    def _checker(self):
+        if not self._compat_checker:
+            self._compat_checker = ExpressionExpressionChecker()
+        return self._compat_checker
+
+    def prepare(self):
+        """Create the compatibility checker now instead of at the
+        first check"""
+        with self._lock:
+            self._checker()
+
+    def _matrix_compatibility(self, key):
+        outbound, inbound, usecase, provisioning, resources = key
+        verdict = self.matrix.lookup(outbound, inbound, usecase, provisioning, resources)
+        if not verdict:
+            return None
+        # the matrix only has the verdicts, not the details from licomp
+        return {
+            'meta': {
+                'tool': 'sbom-compliance-tool',
+                'file': 'compatibility-matrix',
+            },
+            'inbound': inbound,
+            'outbound': outbound,
+            'usecase': usecase,
+            'resources': list(resources),
+            'provisioning': provisioning,
+            'compatibility': verdict,
+        }
+
+    def _cached_compatibility(self, key):
+        """The compatibility in the cache, in the matrix or in the
+        store, None if not checked before"""
+        compat = self.cache.get(key)
+        if compat:
+            return compat
+
+        if self.matrix:
+            compat = self._matrix_compatibility(key)
+            if compat:
+                self.cache.put(key, compat)
+                return compat
+
+        if self.store:
+            with self.timings.stage('store'):
+                compat = self.store.get(key)
+            if compat:
+                self.cache.put(key, compat)
+        return compat
+
+    def _licomp_compatibility(self, outbound, inbound, usecase, provisioning, resources):
+        with self._lock, self.timings.stage('licomp'):
+            self.licomp_calls += 1
+            start = time.perf_counter()
+            compat = self._checker().check_compatibility(outbound,
+                                                         inbound,
+                                                         usecase,
+                                                         provisioning,
+                                                         resources)
+            if len(resources) == 1:
+                self.resource_latencies.add(resources[0], time.perf_counter() - start)
+            return compat
+
+    def _resource_tiers(self, resources, usecase, provisioning):
+        """The resources, cheapest first. The cost is measured, once
+        per set of resources, by checking a probe license pair"""
+        key = tuple(sorted(resources))
+        with self._tiers_lock:
+            if key not in self._tiers:
+                for resource in key:
+                    for probe in range(PROBES):
+                        self._licomp_compatibility(PROBE_OUTBOUND, PROBE_INBOUND, usecase, provisioning, [resource])
+                self._tiers[key] = sorted(key, key=self.resource_latencies.min)
+                logging.info(f'Resource tiers: {", ".join(self._tiers[key])}')
+            return self._tiers[key]
+
+    def _tiered_compatibility(self, outbound, inbound, usecase, provisioning, resources):
+        """Check the compatibility with one resource at a time, until
+        a resource decides the verdict. If none does, the verdict is
+        'depends' if any resource said so, otherwise 'unsupported'."""
+        consulted = []
+        decided = None
+        undecided = None
+        for resource in self._resource_tiers(resources, usecase, provisioning):
+            compat = self._licomp_compatibility(outbound, inbound, usecase, provisioning, [resource])
+            consulted.append(resource)
+            if compat['compatibility'] not in UNDECIDED_VERDICTS:
+                decided = resource
+                break
+            if not undecided or compat['compatibility'] == 'depends':
+                undecided = compat
+        else:
+            compat = undecided
+
+        with self._tiers_lock:
+            self.tier_decisions[decided] = self.tier_decisions.get(decided, 0) + 1
+        compat = dict(compat)
+        compat['tier'] = {
+            'tier': len(consulted) if decided else None,
+            'resource': decided,
+            'consulted': consulted,
+        }
+        return compat
+
+    def _compatibility_key(self, outbound, inbound, usecase, provisioning, resources):
+        if self.tiered:
+            # tiered verdicts may differ from verdicts using all
+            # resources at once, and between orders of the resources
+            order = '>'.join(self._resource_tiers(resources, usecase, provisioning))
+            resources = list(resources) + [f'{TIERED_KEY}:{order}']
+        return self.cache.compatibility_key(outbound, inbound, usecase, provisioning, resources)
+
+    def _check_compatibility(self, outbound, inbound, usecase, provisioning, resources):
+        key = self._compatibility_key(outbound, inbound, usecase, provisioning, resources)
+        compat = self._cached_compatibility(key)
+        if compat:
+            return compat
+
+        # only one thread checks a key, the others wait for its verdict
+        with self._pending_lock:
+            pending = self._pending.get(key)
+            checking = pending is None
+            if checking:
+                pending = PendingCheck()
+                self._pending[key] = pending
+        if not checking:
+            return pending.wait()
+
+        try:
+            # the check may have finished after the lookup above
+            compat = self.cache.peek(key)
+            if not compat:
+                compat = self._new_compatibility(key, outbound, inbound, usecase, provisioning, resources)
+            pending.done(compat)
+            return compat
+        except Exception as e:
+            pending.done(error=e)
+            raise
+        finally:
+            with self._pending_lock:
+                del self._pending[key]
+
+    def _new_compatibility(self, key, outbound, inbound, usecase, provisioning, resources):
+        if self.tiered:
+            compat = self._tiered_compatibility(outbound, inbound, usecase, provisioning, resources)
+        else:
+            compat = self._licomp_compatibility(outbound, inbound, usecase, provisioning, resources)
+        self.cache.put(key, compat)
+        if self.store:
+            with self.timings.stage('store'):
+                self.store.put(key, compat)
+        return compat
+
+    def build_matrix(self, licenses, usecases, provisionings, resources):
+        """Create a CompatibilityMatrix with the verdicts, from licomp,
+        for all combinations of the licenses (identified using flame),
+        usecases and provisionings"""
+        identified = dict.fromkeys(self._identify_license(lic) for lic in licenses if lic)
+        matrix = CompatibilityMatrix(identified, usecases, provisionings, resources, licomp_versions())
+        logging.info(f'Building compatibility matrix for {len(identified)} licenses')
+        matrix.build(lambda outbound, inbound, usecase, provisioning:
+                     self._licomp_compatibility(outbound, inbound, usecase, provisioning, resources)['compatibility'])
+        return matrix
+
+    def _counters(self):
+        """The counters in cache_stats() made in this process"""
+        counters = {
+            'size': len(self.cache),
+            'hits': self.cache.hits,
+            'misses': self.cache.misses,
+            'evictions': self.cache.evictions,
+            'licomp_calls': self.licomp_calls,
+            'flame_calls': self.flame_calls,
+        }
+        if self.store:
+            counters['store'] = {'hits': self.store.hits, 'misses': self.store.misses}
+        if self.matrix:
+            counters['matrix'] = {'hits': self.matrix.hits, 'misses': self.matrix.misses}
+        if self.tiered:
+            counters['tier_decisions'] = {str(resource): count for resource, count in self.tier_decisions.items()}
+        return counters
+
+    def cache_stats(self):
+        """The cache statistics and counters, including the ones from
+        the worker processes"""
+        stats = self.cache.stats()
+        stats['licomp_calls'] = self.licomp_calls
+        stats['flame_calls'] = self.flame_calls
+        if self.store:
+            stats['store'] = self.store.stats()
+        if self.matrix:
+            stats['matrix'] = self.matrix.stats()
+        if self.tiered:
+            stats['resources'] = self.resource_latencies.stats()
+            stats['tier_decisions'] = {str(resource): count for resource, count in self.tier_decisions.items()}
+        if self._worker_counters:
+            stats['workers'] = len(self._worker_counters)
+            for counters in list(self._worker_counters.values()):
+                _add_counters(stats, counters)
+        return stats
+
+    def _package_compatibility_report(self, package, usecase, provisioning, modified, resources, reused_verdicts=None):
+        """Create the report for a package. reused_verdicts, verdicts
+        from a baseline with (inbound license, usecase) as key, are used
+        instead of checking compatibility."""
         outbound = package["license"]
+        identified_outbound = self._identify_license(outbound)
         report = {
             'name': package["name"],
             'version': package["version"],
             'license': outbound,
         }
 
-        compat_checker = ExpressionExpressionChecker()
-        deps = []
-        top_compat = None
+        # Group the dependencies by evaluation key (inbound license
+        # and usecase) and check each group once
+        dep_keys = []
+        groups = {}
         for dep in package['dependencies']:
-            inbound = dep['license']
             usecase = dep.get('usecase', usecase)
-            if inbound:
-                dep_compat = compat_checker.check_compatibility(self._identify_license(outbound),
-                                                                self._identify_license(inbound),
-                                                                usecase,
-                                                                provisioning,
-                                                                resources)
+            key = (dep['license'], usecase)
+            dep_keys.append(key)
+            groups[key] = groups.get(key, 0) + 1
+
+        verdicts = {}
+        for inbound, group_usecase in groups:
+            if reused_verdicts and (inbound, group_usecase) in reused_verdicts:
+                verdicts[(inbound, group_usecase)] = reused_verdicts[(inbound, group_usecase)]
+            elif inbound:
+                verdicts[(inbound, group_usecase)] = self._check_compatibility(identified_outbound,
+                                                                               self._identify_license(inbound),
+                                                                               group_usecase,
+                                                                               provisioning,
+                                                                               resources)
             else:
-                dep_compat = {
+                verdicts[(inbound, group_usecase)] = {
                     'compatibility': 'missing-license',
                 }
 
+        # All dependencies in a group share the same verdict (details)
+        deps = []
+        for dep, key in zip(package['dependencies'], dep_keys):
+            dep_compat = verdicts[key]
             new_dep = dep.copy()
-            compat = dep_compat['compatibility']
-            new_dep['compatibility'] = compat
+            new_dep['compatibility'] = dep_compat['compatibility']
             new_dep['compatibility_details'] = dep_compat
             deps.append(new_dep)
+
+        top_compat = None
+        compatibility_groups = []
+        for key, count in groups.items():
+            compat = verdicts[key]['compatibility']
             top_compat = self.update_compat(top_compat, compat)
+            compatibility_groups.append({
+                'license': key[0],
+                'usecase': key[1],
+                'compatibility': compat,
+                'count': count,
+            })
 
         report['compatibility'] = top_compat
         report['dependencies'] = deps
+        report['compatibility_groups'] = compatibility_groups
+
+        return report
+
+    def _edge_compatibility(self, outbound, inbound, usecase, provisioning, resources):
+        if not inbound:
+            return 'missing-license'
+        return self._check_compatibility(self._identify_license(outbound),
+                                         self._identify_license(inbound),
+                                         usecase,
+                                         provisioning,
+                                         resources)['compatibility']
 
+    def graph_compatibility(self, graph, provisioning, resources):
+        """The transitive compatibility of each node (ref) in the
+        dependency graph (DependencyGraph), i.e. the worst verdict of
+        the node's dependencies, their dependencies and so on.
+
+        The strongly connected components are evaluated once each,
+        after the components they depend on, so the verdict of a shared
+        subtree is reused by all nodes depending on it. All nodes in a
+        cycle get the same verdict."""
+        verdicts = {}
+        with self.timings.stage('transitive'):
+            for component in graph.components():
+                members = set(component)
+                compat = None
+                for ref in component:
+                    outbound = graph.license(ref)
+                    for dependency_ref, usecase in graph.dependencies(ref):
+                        compat = self.update_compat(compat, self._edge_compatibility(outbound,
+                                                                                     graph.license(dependency_ref),
+                                                                                     usecase,
+                                                                                     provisioning,
+                                                                                     resources))
+                        if dependency_ref not in members:
+                            compat = self.update_compat(compat, verdicts[dependency_ref])
+                for ref in component:
+                    verdicts[ref] = compat
+        return verdicts
+
+    def _add_transitive(self, report, package, transitive):
+        ref = package.get('ref')
+        if transitive and ref in transitive:
+            report['transitive_compatibility'] = transitive[ref]
         return report
 
-    def compatibility_report(self, sbom, usecase, provisioning, modified, resources=None):
+    def _workers(self, jobs):
+        """The worker processes, each setting up flame and licomp once.
+        The workers are started when first needed and reused, with
+        their caches, for all SBoMs until close()."""
+        store_path = self.store.path if self.store else None
+        store_version = self.store.version if self.store else None
+        matrix_path = self.matrix.path if self.matrix else None
+        executor_args = (jobs, self.cache.max_size, store_path, store_version, matrix_path, self.tiered, dict(self._tiers))
+        if self._executor and self._executor_args != executor_args:
+            self.close()
+        if not self._executor:
+            logging.info(f'Starting {jobs} worker processes')
+            self._executor = ProcessPoolExecutor(max_workers=jobs,
+                                                 initializer=_init_worker,
+                                                 initargs=executor_args[1:])
+            self._executor_args = executor_args
+        return self._executor
+
+    def close(self):
+        """Stop the worker processes, if any"""
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_args = None
+
+    def _parallel_packages_report(self, packages, usecase, provisioning, modified, resources, jobs, baseline):
+        """Create the package reports in the worker processes. The
+        reports are yielded in the same order as the packages."""
+        chunksize = max(1, len(packages) // (jobs * 4))
+        if self.tiered:
+            # measured here, all workers use the same order
+            self._resource_tiers(resources, usecase, provisioning)
+        logging.info(f'Checking {len(packages)} packages using {jobs} processes')
+        package_args = [(package, usecase, provisioning, modified, resources, self._reused_verdicts(baseline, package, resources, provisioning))
+                        for package in packages]
+        for report, pid, counters in self._workers(jobs).map(_worker_package_report, package_args, chunksize=chunksize):
+            self._worker_counters[pid] = counters
+            yield report
+
+    def _reused_verdicts(self, baseline, package, resources, provisioning):
+        if not baseline:
+            return None
+        return baseline.package_verdicts(package, resources, provisioning)
+
+    def compatibility_report_packages(self, sbom, usecase, provisioning, modified, resources=None, jobs=1, baseline=None):
+        """Yield the report for each package, as soon as it is
+        created. With a baseline (ReportBaseline) the verdicts for
+        unchanged dependencies are reused."""
         sbom_content = sbom['sbom']
         sbom_packages = sbom_content['packages']
 
         if not resources:
             resources = LicompToolkit().licomp_standard_resources()
 
-        packages_report = []
+        # transitive verdicts, if the SBoM has a dependency graph
+        transitive = None
+        graph = sbom_content.get('graph')
+        if graph:
+            if isinstance(graph, dict):
+                graph = DependencyGraph.from_dict(graph)
+            transitive = self.graph_compatibility(graph, provisioning, list(resources))
+
+        if jobs > 1 and len(sbom_packages) > 1:
+            reports = self._parallel_packages_report(sbom_packages, usecase, provisioning, modified, list(resources), jobs, baseline)
+            for s_pkg, report in zip(sbom_packages, reports):
+                yield self._add_transitive(report, s_pkg, transitive)
+            return
+
+        if not baseline:
+            # with a baseline, only the licenses needing a check are identified (when needed)
+            self.identify_licenses(sbom)
         for s_pkg in sbom_packages:
-            package_report = self._package_compatibility_report(s_pkg, usecase, provisioning, modified, resources)
-            packages_report.append(package_report)
+            report = self._package_compatibility_report(s_pkg, usecase, provisioning, modified, resources,
+                                                        self._reused_verdicts(baseline, s_pkg, resources, provisioning))
+            yield self._add_transitive(report, s_pkg, transitive)
+
+    def _gate_verdicts(self, checks, provisioning, resources):
+        """Yield the evaluation key and verdict of the checks, keys of
+        (outbound, inbound, usecase), cheapest first: missing licenses,
+        verdicts in the cache or store and then the remaining checks,
+        the ones with the shortest license expressions first"""
+        remaining = []
+        for key in checks:
+            outbound, inbound, usecase = key
+            if not inbound:
+                yield key, 'missing-license'
+                continue
+            identified_outbound = self._identify_license(outbound)
+            identified_inbound = self._identify_license(inbound)
+            compat = self._cached_compatibility(self._compatibility_key(identified_outbound,
+                                                                        identified_inbound,
+                                                                        usecase,
+                                                                        provisioning,
+                                                                        resources))
+            if compat:
+                yield key, compat['compatibility']
+            else:
+                remaining.append((len(identified_outbound.split()) + len(identified_inbound.split()),
+                                  key, identified_outbound, identified_inbound))
+
+        for cost, key, identified_outbound, identified_inbound in sorted(remaining, key=lambda check: check[0]):
+            compat = self._check_compatibility(identified_outbound, identified_inbound, key[2], provisioning, resources)
+            yield key, compat['compatibility']
+
+    def policy_gate(self, sbom, usecase, provisioning, modified, fail_on, resources=None):
+        """Check the dependencies in the SBoM until one has a
+        compatibility at least as severe as fail_on (see
+        COMPATIBILITY_SEVERITY). Each distinct check is made once,
+        cheapest first. Returns a minimal report with the status
+        ('failed' or 'passed') and, if failed, the offending
+        dependencies."""
+        if not resources:
+            resources = LicompToolkit().licomp_standard_resources()
+        threshold = COMPATIBILITY_SEVERITY[fail_on]
+
+        # (outbound, inbound, usecase) -> the packages and dependencies with it
+        checks = {}
+        for package in sbom['sbom']['packages']:
+            for dep in package['dependencies']:
+                key = (package['license'], dep['license'], dep.get('usecase', usecase))
+                checks.setdefault(key, []).append((package, dep))
+
+        report = {
+            'fail_on': fail_on,
+            'status': 'passed',
+            'compatibility': None,
+            'checks': len(checks),
+            'checked': 0,
+            'offending': [],
+        }
+        for key, compat in self._gate_verdicts(checks, provisioning, resources):
+            report['checked'] += 1
+            report['compatibility'] = self.update_compat(report['compatibility'], compat)
+            if COMPATIBILITY_SEVERITY[compat] >= threshold:
+                report['status'] = 'failed'
+                report['offending'] = [{
+                    'package': {
+                        'name': package['name'],
+                        'version': package['version'],
+                        'license': package['license'],
+                    },
+                    'dependency': {
+                        'name': dep['name'],
+                        'version': dep['version'],
+                        'license': dep['license'],
+                        'usecase': key[2],
+                    },
+                    'compatibility': compat,
+                } for package, dep in checks[key]]
+                break
+        return report
+
+    def compatibility_report(self, sbom, usecase, provisioning, modified, resources=None, jobs=1, baseline=None):
+        packages_report = list(self.compatibility_report_packages(sbom, usecase, provisioning, modified, resources, jobs, baseline))
 
         return {
             'packages': packages_report,
@@ -2,45 +2,172 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import importlib
 import logging
+import threading
 
-from sbom_compliance_tool.reader.native import NativeSBoMReader
-from sbom_compliance_tool.reader.cyclonedx import CyclonedxSBoMReader
-from sbom_compliance_tool.reader.spdx import SPDXSBoMReader
+from sbom_compliance_tool.reader.detector import SBoMFormatDetector
+from sbom_compliance_tool.reader.detector import FORMAT_NATIVE
+from sbom_compliance_tool.reader.detector import FORMAT_CYCLONEDX
+from sbom_compliance_tool.reader.detector import FORMAT_SPDX
+from sbom_compliance_tool.timings import Timings
+
+# The reader implementations, imported when the format is used
+READERS = {
+    FORMAT_NATIVE: 'sbom_compliance_tool.reader.native.NativeSBoMReader',
+    FORMAT_CYCLONEDX: 'sbom_compliance_tool.reader.cyclonedx.CyclonedxSBoMReader',
+    FORMAT_SPDX: 'sbom_compliance_tool.reader.spdx.SPDXSBoMReader',
+}
+
+# Reader options not changing the normalized SBoM, left out of the
+# normalized SBoM cache key
+UNCACHED_READER_OPTIONS = ['low_memory', 'fast_spdx', 'license_texts']
 
 class SBoMComplianceTool:
+    """Reads SBoMs, in any of the supported formats, and normalizes
+    them. Each SBoM is read by a reader of its own, so an instance can
+    be used from several threads at the same time.
+    """
 
-    def __init__(self):
-        self._implementations = [NativeSBoMReader, CyclonedxSBoMReader, SPDXSBoMReader]
-        self._implementation = None
+    def __init__(self, reader_options=None, timings=None, sbom_cache=None):
+        # options passed to the readers, e.g. {'low_memory': True}
+        self._reader_options = reader_options or {}
+        self.timings = timings or Timings()
+        # NormalizedSBoMCache, SBoM files already normalized are read from it
+        self.sbom_cache = sbom_cache
+        self._readers = dict(READERS)
+        self._detector = SBoMFormatDetector()
+        # the reader used last, per thread, see normalized_sbom()
+        self._local = threading.local()
 
-    def _from_sbom(self, file_path, data):
-        for implementation in self._implementations:
-            try:
-                impl = implementation()
+    def register_reader(self, sbom_format, reader):
+        """Add (or replace) the reader for a format. The reader is a
+        class or the dotted path to the class"""
+        self._readers[sbom_format] = reader
+
+    def _reader_class(self, sbom_format):
+        reader = self._readers[sbom_format]
+        if isinstance(reader, str):
+            module_name, class_name = reader.rsplit('.', 1)
+            reader = getattr(importlib.import_module(module_name), class_name)
+            self._readers[sbom_format] = reader
+        return reader
+
+    def _implementations(self):
+        return [self._reader_class(sbom_format) for sbom_format in self._readers]
+
+    def prepare(self):
+        """Import the readers and load the license text data now
+        instead of when reading the first SBoM"""
+        self._implementations()
+        license_texts = self._reader_options.get('license_texts')
+        if license_texts:
+            license_texts.prepare()
+
+    def _from_detected_format(self, file_path, data):
+        """Read the SBoM once, detect the format and pass the loaded
+        data to the reader for that format. Returns the normalized SBoM
+        (None if failed) and the loaded data."""
+        try:
+            with self.timings.stage('detect'):
                 if file_path:
+                    sbom_format, data = self._detector.detect_file(file_path, self._reader_options.get('low_memory', False))
+                else:
+                    sbom_format, data = self._detector.detect_data(data)
+        except Exception as e:
+            logging.info(f'Failed detecting format of {file_path}. Exception: {e}')
+            return None, data
+
+        if not sbom_format:
+            logging.info(f'Could not detect format of {file_path}')
+            return None, data
+
+        implementation = self._reader_class(sbom_format)
+        self.timings.count('reader_attempts')
+        try:
+            with self.timings.stage(f'read_{sbom_format}'):
+                impl = implementation(self._reader_options)
+                if data is None:
                     logging.info(f'Reading {file_path} with {implementation}')
                     impl.normalize_sbom_file(file_path)
-                    self._implementation = impl
-                    return self.normalized_sbom()
                 else:
-                    logging.info(f'Reading data with {implementation}')
+                    logging.info(f'Reading {sbom_format} data with {implementation}')
                     impl.normalize_sbom_data(data)
-                    self._implementation = impl
-                    return self.normalized_sbom()
+            return self._normalized_by(impl), data
+        except Exception as e:
+            self.timings.count('reader_failures')
+            logging.info(f'Failed reading {file_path} with detected format {sbom_format}. Exception: {e}')
+        return None, data
+
+    def _from_sbom(self, file_path, data):
+        normalized_sbom, loaded_data = self._from_detected_format(file_path, data)
+        if normalized_sbom:
+            return normalized_sbom
+
+        # Fall back to trying all readers
+        if loaded_data is not None:
+            data = loaded_data
+        for implementation in self._implementations():
+            self.timings.count('reader_attempts')
+            try:
+                with self.timings.stage('read_fallback'):
+                    impl = implementation(self._reader_options)
+                    if file_path:
+                        logging.info(f'Reading {file_path} with {implementation}')
+                        impl.normalize_sbom_file(file_path)
+                        return self._normalized_by(impl)
+                    else:
+                        logging.info(f'Reading data with {implementation}')
+                        impl.normalize_sbom_data(data)
+                        return self._normalized_by(impl)
                 if not self._normalized_sbom:
                     raise Exception(f'Failed parsing {file_path}')
             except Exception as e:
+                self.timings.count('reader_failures')
                 logging.info(f'Failed reading {file_path} with {implementation}. Exception: {e}')
 
+    def _normalized_by(self, impl):
+        # the normalized SBoM is taken from the reader used in this
+        # call, the reader is only kept for normalized_sbom()
+        self._local.implementation = impl
+        return impl.normalized_sbom()
+
     def supported_formats(self):
-        return [impl().supported_sbom() for impl in self._implementations]
+        return [impl().supported_sbom() for impl in self._implementations()]
+
+    def _cache_options(self):
+        return {key: value for key, value in self._reader_options.items() if key not in UNCACHED_READER_OPTIONS}
+
+    def _from_sbom_cache(self, key, file_path, data):
+        with self.timings.stage('sbom_cache'):
+            normalized_sbom = self.sbom_cache.get(key)
+        if normalized_sbom:
+            logging.info(f'Read normalized {file_path or "SBoM data"} from cache')
+            return normalized_sbom
+
+        normalized_sbom = self._from_sbom(file_path, data)
+        if normalized_sbom:
+            with self.timings.stage('sbom_cache'):
+                self.sbom_cache.put(key, normalized_sbom)
+        return normalized_sbom
 
     def from_sbom_file(self, file_path):
-        return self._from_sbom(file_path, None)
+        if not self.sbom_cache:
+            return self._from_sbom(file_path, None)
+
+        with self.timings.stage('sbom_cache'):
+            key = self.sbom_cache.key(file_path, self._cache_options())
+        return self._from_sbom_cache(key, file_path, None)
 
     def from_sbom_data(self, data):
-        return self._from_sbom(None, data)
+        if not self.sbom_cache or not isinstance(data, (bytes, str)):
+            return self._from_sbom(None, data)
+
+        with self.timings.stage('sbom_cache'):
+            key = self.sbom_cache.data_key(data, self._cache_options())
+        return self._from_sbom_cache(key, None, data)
 
     def normalized_sbom(self):
-        return self._implementation.normalized_sbom()
+        """The SBoM normalized last by the calling thread (prefer the
+        value returned by from_sbom_file or from_sbom_data)"""
+        return self._local.implementation.normalized_sbom()
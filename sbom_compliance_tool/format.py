@@ -3,11 +3,22 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import json
+import os
+import re
 
 FORMAT_JSON = 'json'
+FORMAT_JSONL = 'jsonl'
 FORMAT_MARKDOWN = 'markdown'
-FORMATS = [FORMAT_JSON, FORMAT_MARKDOWN]
+FORMATS = [FORMAT_JSON, FORMAT_JSONL, FORMAT_MARKDOWN]
 DEFAULT_FORMAT = FORMAT_JSON
+# media type of the reports, per format
+CONTENT_TYPES = {
+    FORMAT_JSON: 'application/json',
+    FORMAT_JSONL: 'application/x-ndjson',
+    FORMAT_MARKDOWN: 'text/markdown',
+}
+# index file, with the summary, for Markdown reports written to a directory
+INDEX_FILE = 'index.md'
 
 class SBoMReportFormatterFactory():
 
@@ -17,6 +28,8 @@ class SBoMReportFormatterFactory():
             return SBoMReportFormatterMarkdown()
         elif fmt.lower() == FORMAT_JSON:
             return SBoMReportFormatterJson()
+        elif fmt.lower() == FORMAT_JSONL:
+            return SBoMReportFormatterJsonLines()
         raise Exception(f'Format "{fmt}" not supported.')
 
 class SBoMReportFormatter():
@@ -24,60 +37,216 @@ class SBoMReportFormatter():
     def format(self, report):
         return None
 
+    def write(self, packages, out):
+        """Write the report for the packages, an iterable of package
+        reports, to the file object out"""
+        out.write(self.format({'packages': list(packages)}))
+        out.write('\n')
+
 
 class SBoMReportFormatterJson(SBoMReportFormatter):
 
     def format(self, report):
         return json.dumps(report, indent=4)
 
-class SBoMReportFormatterMarkdown(SBoMReportFormatter):
-
-    def _format_package(self, package):
-        lines = []
-        lines.append(f'## {package["name"]}')
-        lines.append('')
-        lines.append('### Summary')
-        lines.append(f'* name: {package["name"]}')
-        lines.append(f'* version: {package["version"]}')
-        lines.append(f'* otbound license: {package["license"]}')
-        lines.append(f'* dependencies: {len(package["dependencies"])}')
-        lines.append(f'* compatibility: {package["compatibility"]}')
-        comps = {}
+    def write(self, packages, out):
+        # Writes the same output as format, but one package at a time
+        indent = ' ' * 8
+        empty = True
+        out.write('{\n    "packages": [')
+        for package in packages:
+            if not empty:
+                out.write(',')
+            out.write('\n' + indent)
+            out.write(json.dumps(package, indent=4).replace('\n', '\n' + indent))
+            out.flush()
+            empty = False
+        if empty:
+            out.write(']\n}\n')
+        else:
+            out.write('\n    ]\n}\n')
+
+class SBoMReportFormatterJsonLines(SBoMReportFormatter):
+    """JSON Lines, one record per dependency (or per package if the
+    package has no dependencies)"""
+
+    def _package_records(self, package):
+        package_info = {
+            'name': package['name'],
+            'version': package['version'],
+            'license': package['license'],
+            'compatibility': package['compatibility'],
+        }
+        if 'transitive_compatibility' in package:
+            package_info['transitive_compatibility'] = package['transitive_compatibility']
+        if not package['dependencies']:
+            yield {
+                'package': package_info,
+                'dependency': None,
+            }
         for dep in package['dependencies']:
-            comp = dep["compatibility"]
-            comps[comp] = comps.get(comp, 0) + 1
-        lines.append('* compatibility details:')
-        for comp in comps:
-            lines.append(f'    * {comp}:{comps[comp]}')
-
-        lines.append('')
-        lines.append('### Details')
-        lines.append('')
-        lines.append('#### Dependencies ')
-        for dep in package['dependencies']:
-            lines.append('')
-            lines.append(f'##### {dep["name"]}')
-            lines.append('')
-            lines.append(f'* version: {dep["version"]}')
-            lines.append(f'* license: {dep["license"]}')
-            lines.append(f'* compatibility: {dep["compatibility"]}')
-            if dep["license"] and dep["license"] != '':
-                # at some point, move the stuff that belongs to the top level
-                lines.append(f'* usecase: {dep["compatibility_details"]["usecase"]}')
-                lines.append(f'* provisioning: {dep["compatibility_details"]["provisioning"]}')
-                lines.append('* modified: ')
-
-        lines.append('')
-        return "\n".join(lines)
+            yield {
+                'package': package_info,
+                'dependency': dep,
+            }
 
     def format(self, report):
         lines = []
+        for package in report['packages']:
+            for record in self._package_records(package):
+                lines.append(json.dumps(record))
+        return "\n".join(lines)
+
+    def write(self, packages, out):
+        for package in packages:
+            for record in self._package_records(package):
+                out.write(json.dumps(record))
+                out.write('\n')
+            out.flush()
 
-        lines.append('# Compliance report')
-        lines.append('')
-        lines.append('')
+class SBoMReportFormatterMarkdown(SBoMReportFormatter):
+    """Markdown, written one line at a time so that the report is never
+    kept as one string. With write_sharded, each package is written to
+    a file of its own in a directory, together with an index file."""
+
+    def _summary_lines(self, package):
+        yield f'## {package["name"]}'
+        yield ''
+        yield '### Summary'
+        yield f'* name: {package["name"]}'
+        yield f'* version: {package["version"]}'
+        yield f'* otbound license: {package["license"]}'
+        yield f'* dependencies: {len(package["dependencies"])}'
+        yield f'* compatibility: {package["compatibility"]}'
+        if 'transitive_compatibility' in package:
+            yield f'* transitive compatibility: {package["transitive_compatibility"]}'
+        yield '* compatibility details:'
+        for comp, count in self._count_compatibility(package['dependencies']).items():
+            yield f'    * {comp}:{count}'
+
+        yield ''
+        yield '### Details'
+        yield ''
+        yield '#### Dependencies '
+
+    def _dependency_lines(self, dep):
+        yield ''
+        yield f'##### {dep["name"]}'
+        yield ''
+        yield f'* version: {dep["version"]}'
+        yield f'* license: {dep["license"]}'
+        yield f'* compatibility: {dep["compatibility"]}'
+        if dep["license"] and dep["license"] != '':
+            # at some point, move the stuff that belongs to the top level
+            yield f'* usecase: {dep["compatibility_details"]["usecase"]}'
+            yield f'* provisioning: {dep["compatibility_details"]["provisioning"]}'
+            if 'tier' in dep['compatibility_details']:
+                tier = dep['compatibility_details']['tier']
+                yield f'* decided by: {tier["resource"]} (tier {tier["tier"]})'
+            yield '* modified: '
+
+    def _package_lines(self, package):
+        yield from self._summary_lines(package)
+        for dep in package['dependencies']:
+            yield from self._dependency_lines(dep)
+        yield ''
+
+    def _header_lines(self):
+        yield '# Compliance report'
+        yield ''
+        yield ''
+
+    def _count_compatibility(self, items, counts=None):
+        counts = {} if counts is None else counts
+        for item in items:
+            comp = item["compatibility"]
+            counts[comp] = counts.get(comp, 0) + 1
+        return counts
+
+    def _format_package(self, package):
+        return "\n".join(self._package_lines(package))
+
+    def format(self, report):
+        lines = list(self._header_lines())
         for package in report['packages']:
-            package_report = self._format_package(package)
-            lines.append(package_report)
+            lines.extend(self._package_lines(package))
 
         return "\n".join(lines)
+
+    def _write_lines(self, lines, out):
+        for line in lines:
+            out.write(line)
+            out.write('\n')
+
+    def write(self, packages, out):
+        # Writes the same output as format, but one line at a time
+        self._write_lines(self._header_lines(), out)
+        for package in packages:
+            self._write_lines(self._package_lines(package), out)
+            out.flush()
+
+    def _file_name(self, number, name, part):
+        name = re.sub(r'[^A-Za-z0-9._-]+', '_', str(name)).strip('._') or 'package'
+        if part == 1:
+            return f'{number:05d}-{name}.md'
+        return f'{number:05d}-{name}-{part}.md'
+
+    def write_sharded(self, packages, output_dir, shard_size=0):
+        """Write the report for each package, an iterable of package
+        reports, to a file of its own in output_dir. With shard_size,
+        packages with more dependencies than shard_size are split in
+        several files. Finally an index file (INDEX_FILE), with the
+        summary counts and links to the files, is written. Returns the
+        path to the index file."""
+        if shard_size < 0:
+            raise Exception(f'Shard size must be 0 or more, not {shard_size}')
+        os.makedirs(output_dir, exist_ok=True)
+        entries = []
+        package_counts = {}
+        dependency_counts = {}
+        nr_dependencies = 0
+        for number, package in enumerate(packages, 1):
+            deps = package['dependencies']
+            size = shard_size or len(deps) or 1
+            files = []
+            for part, start in enumerate(range(0, max(len(deps), 1), size), 1):
+                file_name = self._file_name(number, package['name'], part)
+                with open(os.path.join(output_dir, file_name), 'w') as out:
+                    if part == 1:
+                        self._write_lines(self._summary_lines(package), out)
+                    else:
+                        self._write_lines([f'## {package["name"]} (part {part})', '', '#### Dependencies '], out)
+                    for dep in deps[start:start + size]:
+                        self._write_lines(self._dependency_lines(dep), out)
+                    self._write_lines([''], out)
+                files.append(file_name)
+            self._count_compatibility([package], package_counts)
+            self._count_compatibility(deps, dependency_counts)
+            nr_dependencies += len(deps)
+            entries.append((package['name'], package['version'], package['compatibility'], len(deps), files))
+
+        index_path = os.path.join(output_dir, INDEX_FILE)
+        with open(index_path, 'w') as out:
+            self._write_lines(self._index_lines(entries, nr_dependencies, package_counts, dependency_counts), out)
+        return index_path
+
+    def _index_lines(self, entries, nr_dependencies, package_counts, dependency_counts):
+        yield '# Compliance report'
+        yield ''
+        yield '### Summary'
+        yield f'* packages: {len(entries)}'
+        yield f'* dependencies: {nr_dependencies}'
+        yield '* compatibility:'
+        for comp, count in package_counts.items():
+            yield f'    * {comp}:{count}'
+        yield '* dependency compatibility:'
+        for comp, count in dependency_counts.items():
+            yield f'    * {comp}:{count}'
+        yield ''
+        yield '### Packages'
+        yield ''
+        for name, version, compatibility, nr_deps, files in entries:
+            yield f'* [{name} {version}]({files[0]}): {compatibility}, {nr_deps} dependencies'
+            for part, file_name in enumerate(files[1:], 2):
+                yield f'    * [part {part}]({file_name})'
+        yield ''
@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+class DependencyGraph():
+    """The dependencies between the components in an SBoM.
+
+    Nodes are identified by a reference (CycloneDX bom-ref, SPDX
+    SPDXID) and have a name, version and license. Each edge goes from
+    a component to one of its dependencies, with the usecase of the
+    dependency. The graph may contain cycles.
+    """
+
+    def __init__(self):
+        # ref -> (name, version, license)
+        self.nodes = {}
+        # ref -> list of (dependency ref, usecase)
+        self.edges = {}
+
+    def add_node(self, ref, name, version, lic):
+        self.nodes[ref] = (name, version, lic)
+
+    def add_edge(self, ref, dependency_ref, usecase):
+        self.edges.setdefault(ref, []).append((dependency_ref, usecase))
+
+    def license(self, ref):
+        """The license of the node, None if the node is not known"""
+        node = self.nodes.get(ref)
+        if not node:
+            return None
+        return node[2]
+
+    def dependencies(self, ref):
+        return self.edges.get(ref, [])
+
+    def reachable(self, ref, reached=None):
+        """All refs reachable from ref, including ref. If reached (a
+        set) is given, it is extended and refs in it are not visited"""
+        if reached is None:
+            reached = set()
+        reached.add(ref)
+        stack = [ref]
+        while stack:
+            for dependency_ref, usecase in self.dependencies(stack.pop()):
+                if dependency_ref not in reached:
+                    reached.add(dependency_ref)
+                    stack.append(dependency_ref)
+        return reached
+
+    def _refs(self):
+        refs = dict.fromkeys(self.nodes)
+        for ref, dependencies in self.edges.items():
+            refs[ref] = None
+            for dependency_ref, usecase in dependencies:
+                refs[dependency_ref] = None
+        return refs
+
+    def components(self):
+        """The strongly connected components (lists of refs), each
+        component after the components it depends on (Tarjan, without
+        recursion to handle deep graphs)"""
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        for root in self._refs():
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.dependencies(root)))]
+            while work:
+                ref, dependencies = work[-1]
+                for dependency_ref, usecase in dependencies:
+                    if dependency_ref not in index:
+                        index[dependency_ref] = lowlink[dependency_ref] = len(index)
+                        stack.append(dependency_ref)
+                        on_stack.add(dependency_ref)
+                        work.append((dependency_ref, iter(self.dependencies(dependency_ref))))
+                        break
+                    if dependency_ref in on_stack:
+                        lowlink[ref] = min(lowlink[ref], index[dependency_ref])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[ref])
+                    if lowlink[ref] == index[ref]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == ref:
+                                break
+                        components.append(component)
+        return components
+
+    def to_dict(self):
+        return {
+            'nodes': {ref: {'name': name, 'version': version, 'license': lic} for ref, (name, version, lic) in self.nodes.items()},
+            'edges': {ref: [{'ref': dependency_ref, 'usecase': usecase} for dependency_ref, usecase in dependencies]
+                      for ref, dependencies in self.edges.items()},
+        }
+
+    @staticmethod
+    def from_dict(data):
+        graph = DependencyGraph()
+        for ref, node in data.get('nodes', {}).items():
+            graph.add_node(ref, node.get('name'), node.get('version'), node.get('license'))
+        for ref, dependencies in data.get('edges', {}).items():
+            for dependency in dependencies:
+                graph.add_edge(ref, dependency['ref'], dependency.get('usecase'))
+        return graph
@@ -0,0 +1,197 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from sbom_compliance_tool.timings import Timings
+
+LICENSE_TEXT_STORE_FILE = 'license_texts.sqlite'
+
+# LookupLicense used in the worker processes
+_worker_lookup = None
+
+def text_key(text):
+    """Key for a license text, the sha256 of the text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def lookup_license_versions():
+    from flame.config import SW_VERSION
+    from lookup_license.config import lookup_license_version
+    return f'lookup-license:{lookup_license_version},flame:{SW_VERSION}'
+
+def _identify_text(lookup, text):
+    lookedup = lookup.lookup_license_text(text)
+    if lookedup['identification'] == 'flame':
+        return ' AND '.join(lookedup['normalized'])
+    return ' AND '.join([x['license'] for x in lookedup['normalized']])
+
+def _init_worker():
+    global _worker_lookup
+    from lookup_license.lookuplicense import LookupLicense
+    _worker_lookup = LookupLicense()
+
+def _worker_identify_text(text):
+    try:
+        return _identify_text(_worker_lookup, text)
+    except Exception as e:
+        logging.debug(f'Failed identifying license text. Exception: {e}')
+        return None
+
+class LicenseTextLookup():
+    """Identifies licenses from license texts (e.g. the extracted
+    licensing info in SPDX documents) using lookup-license.
+
+    The texts are identified by the sha256 of the text, so a text
+    occurring several times (in one or in many SBoMs) is only looked
+    up once. The identified licenses are kept in memory and, if a path
+    is given, stored in SQLite for use in later runs. Texts failing to
+    be identified are stored too (with no license), so they are not
+    looked up again. The entries in the store are tied to the versions
+    of lookup-license and flame.
+
+    With jobs > 1 the texts are looked up in worker processes. The
+    workers are started when first needed and kept until close().
+    """
+
+    def __init__(self, path=None, jobs=1, timings=None):
+        self.path = path
+        self.jobs = jobs
+        self.timings = timings or Timings()
+        self.hits = 0
+        self.misses = 0
+        self._licenses = {}
+        self._lookup = None
+        self._executor = None
+        self._lock = threading.RLock()
+        self._connection = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._create_tables()
+            self._check_version(lookup_license_versions())
+
+    def _create_tables(self):
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS license_texts (key TEXT PRIMARY KEY, license TEXT)')
+
+    def _check_version(self, version):
+        row = self._connection.execute('SELECT value FROM meta WHERE key = ?', ('version',)).fetchone()
+        if row and row[0] == version:
+            return
+        if row:
+            logging.info(f'License text store {self.path} created with other lookup-license version, clearing it')
+        with self._connection:
+            self._connection.execute('DELETE FROM license_texts')
+            self._connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', ('version', version))
+
+    def _stored(self, keys):
+        if not self._connection or not keys:
+            return {}
+        stored = {}
+        keys = list(keys)
+        # stay below SQLite's limit of variables per statement
+        for index in range(0, len(keys), 500):
+            chunk = keys[index:index + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._connection.execute(f'SELECT key, license FROM license_texts WHERE key IN ({placeholders})', chunk)
+            stored.update(rows.fetchall())
+        return stored
+
+    def _store(self, licenses):
+        if not self._connection or not licenses:
+            return
+        with self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO license_texts VALUES (?, ?)', licenses.items())
+
+    def _workers(self):
+        if not self._executor:
+            self._executor = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker)
+        return self._executor
+
+    def _lookup_license(self):
+        if not self._lookup:
+            from lookup_license.lookuplicense import LookupLicense
+            self._lookup = LookupLicense()
+        return self._lookup
+
+    def prepare(self):
+        """Create LookupLicense and load the license index now instead
+        of at the first lookup"""
+        from licensedcode import cache
+        with self._lock:
+            self._lookup_license()
+            # kept by licensedcode, LookupLicense uses the loaded index
+            cache.get_index()
+
+    def _identify_texts(self, texts):
+        """Look up the texts, a dict of key and text. Returns a dict
+        with key and license, None for texts failing to be
+        identified."""
+        if self.jobs > 1 and len(texts) > 1:
+            return dict(zip(texts.keys(), self._workers().map(_worker_identify_text, texts.values())))
+
+        lookup = self._lookup_license()
+        licenses = {}
+        for key, text in texts.items():
+            try:
+                licenses[key] = _identify_text(lookup, text)
+            except Exception as e:
+                logging.debug(f'Failed identifying license text. Exception: {e}')
+                licenses[key] = None
+        return licenses
+
+    def identify(self, texts):
+        """Identify the licenses in texts. Returns a dict with the
+        identified licenses, keyed by text_key(text). Texts failing to
+        be identified (now or before) are left out."""
+        keyed_texts = {text_key(text): text for text in texts}
+        with self._lock:
+            licenses = {key: self._licenses[key] for key in keyed_texts if key in self._licenses}
+            stored = self._stored(key for key in keyed_texts if key not in licenses)
+            self._licenses.update(stored)
+            licenses.update(stored)
+            self.hits += len(licenses)
+
+            missing = {key: text for key, text in keyed_texts.items() if key not in licenses}
+            self.misses += len(missing)
+            if missing:
+                logging.info(f'Looking up {len(missing)} license text(s)')
+                with self.timings.stage('license_texts'):
+                    identified = self._identify_texts(missing)
+                self._licenses.update(identified)
+                self._store(identified)
+                licenses.update(identified)
+        return {key: license for key, license in licenses.items() if license is not None}
+
+    def clear(self):
+        with self._lock:
+            self._licenses = {}
+            if self._connection:
+                with self._connection:
+                    self._connection.execute('DELETE FROM license_texts')
+
+    def close(self):
+        """Stop the worker processes and close the store"""
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown()
+                self._executor = None
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import logging
+import struct
+import threading
+
+MATRIX_MAGIC = b'SCTMATRIX1'
+
+class CompatibilityMatrix():
+    """Precompiled compatibility verdicts for all combinations of
+    outbound license, inbound license, usecase and provisioning, for a
+    list of licenses and a set of resources.
+
+    The verdicts are kept in a dense table, one byte per combination,
+    indexing the list of verdicts. Only the verdict is kept, not the
+    details from licomp. The file format is MATRIX_MAGIC, the length
+    of a JSON header (with the licenses, usecases, provisionings,
+    resources, versions and verdicts) and the table.
+    """
+
+    def __init__(self, licenses, usecases, provisionings, resources, version, verdicts=None, table=None, path=None):
+        self.licenses = list(licenses)
+        self.usecases = list(usecases)
+        self.provisionings = list(provisionings)
+        self.resources = sorted(resources)
+        # the licomp versions (see licomp_versions) used
+        self.version = version
+        # the verdicts in the table, 0 means not checked
+        self.verdicts = verdicts or [None]
+        self.table = table or bytearray(len(self.licenses) ** 2 * len(self.usecases) * len(self.provisionings))
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._license_index = {lic: index for index, lic in enumerate(self.licenses)}
+        self._usecase_index = {usecase: index for index, usecase in enumerate(self.usecases)}
+        self._provisioning_index = {provisioning: index for index, provisioning in enumerate(self.provisionings)}
+
+    def _index(self, outbound, inbound, usecase, provisioning):
+        """Index in the table, None if outside the matrix"""
+        try:
+            index = self._license_index[outbound] * len(self.licenses) + self._license_index[inbound]
+            index = index * len(self.usecases) + self._usecase_index[usecase]
+            return index * len(self.provisionings) + self._provisioning_index[provisioning]
+        except KeyError:
+            return None
+
+    def set(self, outbound, inbound, usecase, provisioning, verdict):
+        if verdict not in self.verdicts:
+            if len(self.verdicts) > 255:
+                raise Exception(f'Too many distinct verdicts, can not add "{verdict}"')
+            self.verdicts.append(verdict)
+        self.table[self._index(outbound, inbound, usecase, provisioning)] = self.verdicts.index(verdict)
+
+    def lookup(self, outbound, inbound, usecase, provisioning, resources):
+        """The verdict, None if not in the matrix"""
+        index = None
+        if sorted(resources) == self.resources:
+            index = self._index(outbound, inbound, usecase, provisioning)
+        verdict = self.verdicts[self.table[index]] if index is not None else None
+        with self._lock:
+            if verdict is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return verdict
+
+    def build(self, check):
+        """Fill the matrix, using check(outbound, inbound, usecase,
+        provisioning) to get the verdicts"""
+        total = len(self.table)
+        done = 0
+        for outbound in self.licenses:
+            for inbound in self.licenses:
+                for usecase in self.usecases:
+                    for provisioning in self.provisionings:
+                        self.set(outbound, inbound, usecase, provisioning, check(outbound, inbound, usecase, provisioning))
+                done += len(self.usecases) * len(self.provisionings)
+            logging.info(f'Compatibility matrix: {done}/{total}')
+
+    def save(self, path):
+        header = json.dumps({
+            'licenses': self.licenses,
+            'usecases': self.usecases,
+            'provisionings': self.provisionings,
+            'resources': self.resources,
+            'version': self.version,
+            'verdicts': self.verdicts,
+        }).encode('utf-8')
+        with open(path, 'wb') as fp:
+            fp.write(MATRIX_MAGIC)
+            fp.write(struct.pack('>I', len(header)))
+            fp.write(header)
+            fp.write(self.table)
+        self.path = path
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as fp:
+            if fp.read(len(MATRIX_MAGIC)) != MATRIX_MAGIC:
+                raise Exception(f'{path} is not a compatibility matrix')
+            header_size, = struct.unpack('>I', fp.read(4))
+            header = json.loads(fp.read(header_size).decode('utf-8'))
+            table = fp.read()
+        matrix = CompatibilityMatrix(header['licenses'],
+                                     header['usecases'],
+                                     header['provisionings'],
+                                     header['resources'],
+                                     header['version'],
+                                     header['verdicts'],
+                                     table,
+                                     path)
+        if len(table) != len(header['licenses']) ** 2 * len(header['usecases']) * len(header['provisionings']):
+            raise Exception(f'Compatibility matrix {path} is truncated')
+        return matrix
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'licenses': len(self.licenses),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -6,8 +6,12 @@
 # * https://cyclonedx.org/guides/OWASP_CycloneDX-Authoritative-Guide-to-SBOM-en.pdf
 # * https://cyclonedx.org/docs/1.7/xml/#type_classification
 
+import json
 import logging
 
+from defusedxml import ElementTree
+
+from sbom_compliance_tool.graph import DependencyGraph
 from sbom_compliance_tool.reader.sbom_reader import SBoMReader
 
 from licomp.interface import UseCase
@@ -15,9 +19,25 @@ from licomp.interface import UseCase
 from cyclonedx.model.bom import Bom
 from cyclonedx.model.component import ComponentType
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 class CyclonedxSBoMReader(SBoMReader):
+    """Reads CycloneDX (JSON or XML) SBoMs.
+
+    With the option 'low_memory' set, files are read as a stream
+    (XML iterparse and, if ijson is installed, incremental JSON
+    parsing) without creating the cyclonedx Bom object model. The
+    resulting normalized SBoM is the same.
+
+    With the option 'dependency_graph' set, the dependencies section
+    is read into a DependencyGraph, keyed by bom-ref.
+    """
 
-    def __init__(self):
+    def __init__(self, options=None):
+        SBoMReader.__init__(self, options)
         self._normalized_sbom = None
         self.classification_map = {
             ComponentType.APPLICATION.value: UseCase.TOOL,
@@ -40,6 +60,8 @@ class CyclonedxSBoMReader(SBoMReader):
         return UseCase.usecase_to_string(self.classification_map[classification])
 
     def normalize_sbom_file(self, file_path):
+        if self.options.get('low_memory'):
+            return self._stream_sbom_file(file_path)
 
         try:
             data = self._read_xml(file_path)
@@ -67,34 +89,240 @@ class CyclonedxSBoMReader(SBoMReader):
             logging.debug(f'Failed readinf "licenses" from "{component}". Exception: {e}')
         return []
 
-    def normalize_sbom_data(self, data, sbom_format='json'):
+    def normalize_sbom_data(self, data, sbom_format=None):
+        if not sbom_format:
+            sbom_format = 'json' if isinstance(data, dict) else 'xml'
+
+        if self.options.get('low_memory') and sbom_format == 'json':
+            return self._pack_streamed(self._json_metadata_component(data),
+                                       [self._json_component(component) for component in data.get('components', [])],
+                                       [self._json_dependency(dependency) for dependency in data.get('dependencies', [])])
+
         if sbom_format == 'json':
             deserialized_bom = Bom.from_json(data=data)
         elif sbom_format == 'xml':
             deserialized_bom = Bom.from_xml(data=data)
 
         components = []
+        refs = []
         for component in deserialized_bom.components:
             components.append(self._sub_component(component.name,
                                                   component.version,
                                                   self._classification_to_usecase(component.type),
                                                   self._component_license(component)))
+            refs.append(component.bom_ref.value)
 
         licenses = [self._license(lic) for lic in deserialized_bom.metadata.component.licenses]
+        top_ref = None
+        if self._dependency_graph():
+            top_ref = self._ref(deserialized_bom.metadata.component.bom_ref.value)
         try:
             packed_component = self._component(deserialized_bom.metadata.component.name,
                                                deserialized_bom.metadata.component.version,
                                                licenses,
-                                               components)
+                                               components,
+                                               top_ref)
         except Exception as e:
             logging.debug(f'COuld not pack component. Exceptiion: {e}')
             return None
 
-        top_components = self._pack_components([packed_component])
+        graph = None
+        if top_ref:
+            dependencies = [(dependency.ref.value, [dep.ref.value for dep in dependency.dependencies])
+                            for dependency in deserialized_bom.dependencies]
+            graph = self._graph(packed_component, refs, components, dependencies)
+        top_components = self._pack_components([packed_component], graph)
 
         self._normalized_sbom = top_components
         return self._normalized_sbom
 
+    #
+    # Low memory (streaming) reading
+    #
+    # The Bom object model keeps components and licenses in sorted sets,
+    # so the streamed components and licenses are sorted the same way
+    # (on the leading fields of the cyclonedx sort order, None last).
+    #
+    def _sort_key(self, values):
+        return tuple((value is None, value or '') for value in values)
+
+    def _streamed_licenses(self, licenses):
+        """licenses is a list of (acknowledgement, id, name) tuples, or
+        None for a license expression"""
+        if None in licenses:
+            # expressions are not read by the Bom based reader either
+            return []
+        unique_licenses = sorted(set(licenses), key=self._sort_key)
+        names = [lic_id or lic_name for ack, lic_id, lic_name in unique_licenses]
+        if None in names:
+            return []
+        return names
+
+    def _streamed_component(self, component):
+        comp_type, group, name, version, bom_ref, licenses = component
+        return self._sub_component(name,
+                                   version,
+                                   self._classification_to_usecase(comp_type),
+                                   self._streamed_licenses(licenses))
+
+    def _pack_streamed(self, metadata_component, components, dependencies=None):
+        if not metadata_component:
+            raise Exception('No metadata component in CycloneDX SBoM')
+        comp_type, group, name, version, bom_ref, licenses = metadata_component
+        if None in licenses:
+            raise Exception('License expressions not supported for the metadata component')
+        licenses = [lic_id or lic_name for ack, lic_id, lic_name in sorted(set(licenses), key=self._sort_key)]
+
+        sorted_components = sorted(components, key=lambda component: self._sort_key(component[:5]))
+        sub_components = [self._streamed_component(component) for component in sorted_components]
+        top_ref = self._ref(bom_ref) if self._dependency_graph() else None
+        packed_component = self._component(name, version, licenses, sub_components, top_ref)
+        graph = None
+        if top_ref:
+            refs = [component[4] for component in sorted_components]
+            graph = self._graph(packed_component, refs, sub_components, dependencies or [])
+        self._normalized_sbom = self._pack_components([packed_component], graph)
+        return self._normalized_sbom
+
+    #
+    # Dependency graph
+    #
+    def _ref(self, ref, index=None):
+        """The ref, or a generated ref for components without bom-ref"""
+        if ref:
+            return ref
+        if index is None:
+            return 'metadata-component'
+        return f'component-{index}'
+
+    def _graph(self, top_component, refs, components, dependencies):
+        """Create the dependency graph. refs are the bom-refs of the
+        components (NormalizedDependency) and dependencies a list of
+        (ref, list of refs depended on)"""
+        graph = DependencyGraph()
+        graph.add_node(top_component.ref, top_component.name, top_component.version, top_component.license)
+        usecases = {}
+        component_refs = []
+        for index, (ref, component) in enumerate(zip(refs, components)):
+            ref = self._ref(ref, index)
+            graph.add_node(ref, component.name, component.version, component.license)
+            usecases[ref] = component.usecase
+            component_refs.append((ref, component.usecase))
+        unknown = UseCase.usecase_to_string(UseCase.UNKNOWN)
+        for ref, dependency_refs in dependencies:
+            for dependency_ref in dependency_refs:
+                graph.add_edge(ref, dependency_ref, usecases.get(dependency_ref, unknown))
+        self._add_unreachable(graph, top_component.ref, component_refs)
+        return graph
+
+    def _json_metadata_component(self, data):
+        metadata_component = data.get('metadata', {}).get('component')
+        if not metadata_component:
+            return None
+        return self._json_component(metadata_component)
+
+    def _json_component(self, component):
+        licenses = []
+        for lic in component.get('licenses', []):
+            if 'license' in lic:
+                license_info = lic['license']
+                licenses.append((license_info.get('acknowledgement'), license_info.get('id'), license_info.get('name')))
+            else:
+                licenses.append(None)
+        return (component['type'],
+                component.get('group'),
+                component['name'],
+                component.get('version'),
+                component.get('bom-ref'),
+                licenses)
+
+    def _json_dependency(self, dependency):
+        return (dependency['ref'], dependency.get('dependsOn', []))
+
+    def _xml_dependency(self, element):
+        return (element.get('ref'),
+                [child.get('ref') for child in element if self._xml_name(child) == 'dependency'])
+
+    def _xml_child_text(self, element, name):
+        for child in element:
+            if self._xml_name(child) == name:
+                return child.text
+        return None
+
+    def _xml_name(self, element):
+        return element.tag.rsplit('}', 1)[-1]
+
+    def _xml_component(self, element):
+        licenses = []
+        for child in element:
+            if self._xml_name(child) != 'licenses':
+                continue
+            for lic in child:
+                if self._xml_name(lic) == 'license':
+                    licenses.append((lic.get('acknowledgement'), self._xml_child_text(lic, 'id'), self._xml_child_text(lic, 'name')))
+                else:
+                    licenses.append(None)
+        return (element.get('type'),
+                self._xml_child_text(element, 'group'),
+                self._xml_child_text(element, 'name'),
+                self._xml_child_text(element, 'version'),
+                element.get('bom-ref'),
+                licenses)
+
+    def _stream_xml(self, file_path):
+        metadata_component = None
+        components = []
+        dependencies = []
+        path = []
+        parents = []
+        for event, element in ElementTree.iterparse(file_path, events=('start', 'end'), forbid_dtd=True):
+            if event == 'start':
+                path.append(self._xml_name(element))
+                parents.append(element)
+                continue
+            if path == ['bom', 'components', 'component']:
+                components.append(self._xml_component(element))
+                # only keep one component in memory at a time
+                parents[-2].remove(element)
+            elif path == ['bom', 'metadata', 'component']:
+                metadata_component = self._xml_component(element)
+            elif path == ['bom', 'dependencies', 'dependency']:
+                if self._dependency_graph():
+                    dependencies.append(self._xml_dependency(element))
+                parents[-2].remove(element)
+            path.pop()
+            parents.pop()
+
+        return self._pack_streamed(metadata_component, components, dependencies)
+
+    def _stream_json(self, file_path):
+        if not ijson:
+            logging.debug('ijson not installed, reading JSON without streaming')
+            with open(file_path, 'rb') as fp:
+                data = json.load(fp)
+            return self._pack_streamed(self._json_metadata_component(data),
+                                       [self._json_component(component) for component in data.get('components', [])],
+                                       [self._json_dependency(dependency) for dependency in data.get('dependencies', [])])
+
+        with open(file_path, 'rb') as fp:
+            metadata_component = next(ijson.items(fp, 'metadata.component'), None)
+            if metadata_component:
+                metadata_component = self._json_component(metadata_component)
+            fp.seek(0)
+            components = [self._json_component(component) for component in ijson.items(fp, 'components.item', use_float=True)]
+            dependencies = []
+            if self._dependency_graph():
+                fp.seek(0)
+                dependencies = [self._json_dependency(dependency) for dependency in ijson.items(fp, 'dependencies.item')]
+        return self._pack_streamed(metadata_component, components, dependencies)
+
+    def _stream_sbom_file(self, file_path):
+        with open(file_path, 'rb') as fp:
+            head = fp.read(64).lstrip()
+        if head.startswith(b'<'):
+            return self._stream_xml(file_path)
+        return self._stream_json(file_path)
+
     def normalized_sbom(self):
         if not self._normalized_sbom:
             raise Exception('Failed reading SBoM data, not in CycloneDX format')
@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import logging
+
+from defusedxml import ElementTree
+
+FORMAT_NATIVE = 'native'
+FORMAT_CYCLONEDX = 'cyclonedx'
+FORMAT_SPDX = 'spdx'
+
+# nr of characters to look at when sniffing non JSON formats
+SNIFF_SIZE = 4096
+
+class SBoMFormatDetector():
+    """Detects the format of an SBoM, reading (and parsing) the data
+    only once.
+
+    detect_file and detect_data return a tuple with the format
+    (FORMAT_NATIVE, FORMAT_CYCLONEDX, FORMAT_SPDX or None if not
+    detected) and the loaded data: a dict for JSON, an Element for XML
+    and a string for SPDX tag-value. The data is None if the format
+    is detected but has to be read by the reader itself (e.g. SPDX
+    RDF).
+    """
+
+    def detect_file(self, file_path, head_only=False):
+        """Detect the format of a file. With head_only set, only the
+        beginning of the file is read and no data is returned."""
+        if head_only:
+            with open(file_path, 'rb') as fp:
+                head = fp.read(SNIFF_SIZE).decode('utf-8-sig', errors='ignore')
+            return self._detect_head(head), None
+
+        with open(file_path, 'rb') as fp:
+            raw = fp.read()
+        return self.detect_data(raw)
+
+    def _detect_head(self, head):
+        stripped = head.lstrip()
+        if stripped.startswith('{'):
+            if '"sbom-compliance-tool"' in head:
+                return FORMAT_NATIVE
+            if '"bomFormat"' in head:
+                return FORMAT_CYCLONEDX
+            if '"spdxVersion"' in head:
+                return FORMAT_SPDX
+            return None
+        if stripped.startswith('<'):
+            if 'cyclonedx.org/schema/bom' in head:
+                return FORMAT_CYCLONEDX
+            if 'spdx.org/rdf' in head:
+                return FORMAT_SPDX
+            return None
+        sbom_format, data = self._detect_text(None, head)
+        return sbom_format
+
+    def detect_data(self, data):
+        if isinstance(data, bytes):
+            data = data.decode('utf-8-sig')
+
+        if isinstance(data, dict):
+            return self._detect_json(data), data
+
+        if not isinstance(data, str):
+            return None, data
+
+        stripped = data.lstrip()
+        if stripped.startswith('{'):
+            return self._detect_json_text(data)
+        if stripped.startswith('<'):
+            return self._detect_xml_text(data, stripped[:SNIFF_SIZE])
+        return self._detect_text(data, stripped[:SNIFF_SIZE])
+
+    def _detect_json(self, data):
+        try:
+            if data.get('meta', {}).get('format') == 'sbom-compliance-tool':
+                return FORMAT_NATIVE
+        except AttributeError:
+            pass
+        if data.get('bomFormat') == 'CycloneDX':
+            return FORMAT_CYCLONEDX
+        if 'spdxVersion' in data:
+            return FORMAT_SPDX
+        return None
+
+    def _detect_json_text(self, data):
+        try:
+            parsed = json.loads(data)
+        except ValueError as e:
+            logging.debug(f'SBoM data looks like, but is not, JSON. Exception: {e}')
+            return None, data
+        if not isinstance(parsed, dict):
+            return None, parsed
+        return self._detect_json(parsed), parsed
+
+    def _detect_xml_text(self, data, head):
+        if 'cyclonedx.org/schema/bom' in head:
+            try:
+                return FORMAT_CYCLONEDX, ElementTree.fromstring(data, forbid_dtd=True)
+            except Exception as e:
+                logging.debug(f'SBoM data looks like, but is not, CycloneDX XML. Exception: {e}')
+                return None, data
+        if 'spdx.org/rdf' in head:
+            return FORMAT_SPDX, None
+        return None, data
+
+    def _detect_text(self, data, head):
+        for line in head.splitlines():
+            if line.startswith('SPDXVersion:'):
+                return FORMAT_SPDX, data
+            if line.startswith('spdxVersion:'):
+                # SPDX YAML
+                return FORMAT_SPDX, None
+        return None, data
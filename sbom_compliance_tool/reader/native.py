@@ -11,11 +11,11 @@ class NativeSBoMReader(SBoMReader):
     def normalize_sbom_file(self, file_path):
         with open(file_path) as fp:
             data = json.load(fp)
-            if data['meta']['format'] != 'sbom-compliance-tool':
-                raise Exception(f'{file_path} not in SBoM Compliance Tool\'s native format')
             return self.normalize_sbom_data(data)
 
     def normalize_sbom_data(self, data):
+        if data['meta']['format'] != 'sbom-compliance-tool':
+            raise Exception('Data not in SBoM Compliance Tool\'s native format')
         self._normalized_sbom = data
         return data
 
@@ -4,9 +4,13 @@
 
 import json
 import logging
+import sys
+from collections.abc import Mapping
 from defusedxml import ElementTree
 from enum import Enum
 
+from sbom_compliance_tool.graph import DependencyGraph
+
 class SBoMComplianceTags(Enum):
     NAME = 'name'
     VERSION = 'version'
@@ -14,13 +18,153 @@ class SBoMComplianceTags(Enum):
     USECASE = 'usecase'
     PROVISIONING = 'provisioning'
     DEPENENCIES = 'dependencies'
+    REF = 'ref'
+    GRAPH = 'graph'
     PACKAGES = 'packages'
     SBOM = 'sbom'
     META = 'meta'
     LICENSE_OP_AND = 'AND'
 
+class NormalizedRecord(Mapping):
+    """Compact (slotted) record in the normalized SBoM. Behaves as a
+    read only dict, copy() and to_dict() return a dict with the fields
+    in the same order as the dicts normalized SBoMs used to contain."""
+
+    __slots__ = ()
+    _fields = ()
+
+    def _present_fields(self):
+        return self._fields
+
+    def __getitem__(self, key):
+        if key in self._present_fields():
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._present_fields())
+
+    def __len__(self):
+        return len(self._present_fields())
+
+    def __reduce__(self):
+        return (self.__class__, tuple(getattr(self, field) for field in self._fields))
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def copy(self):
+        return self.to_dict()
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self._present_fields()}
+
+class NormalizedDependency(NormalizedRecord):
+
+    __slots__ = ('name', 'version', 'usecase', 'license')
+    _fields = (SBoMComplianceTags.NAME.value,
+               SBoMComplianceTags.VERSION.value,
+               SBoMComplianceTags.USECASE.value,
+               SBoMComplianceTags.LICENSE.value)
+
+    def __init__(self, name, version, usecase, license):
+        self.name = name
+        self.version = version
+        self.usecase = usecase
+        self.license = license
+
+class NormalizedPackage(NormalizedRecord):
+
+    __slots__ = ('name', 'version', 'license', 'dependencies', 'ref')
+    _fields = (SBoMComplianceTags.NAME.value,
+               SBoMComplianceTags.VERSION.value,
+               SBoMComplianceTags.LICENSE.value,
+               SBoMComplianceTags.DEPENENCIES.value)
+
+    def __init__(self, name, version, license, dependencies, ref=None):
+        self.name = name
+        self.version = version
+        self.license = license
+        # tuple of NormalizedDependency
+        self.dependencies = dependencies
+        # reference to the package in the dependency graph, if any
+        self.ref = ref
+
+    def _present_fields(self):
+        if self.ref is None:
+            return self._fields
+        return self._fields + (SBoMComplianceTags.REF.value,)
+
+    def __reduce__(self):
+        return (self.__class__, (self.name, self.version, self.license, self.dependencies, self.ref))
+
+    def to_dict(self):
+        package = NormalizedRecord.to_dict(self)
+        package[SBoMComplianceTags.DEPENENCIES.value] = [dep.to_dict() for dep in self.dependencies]
+        return package
+
+def normalized_sbom_to_dict(normalized_sbom):
+    """Returns the normalized SBoM with all records as dicts, e.g. for
+    writing it as JSON"""
+    sbom = normalized_sbom[SBoMComplianceTags.SBOM.value]
+    packages = sbom[SBoMComplianceTags.PACKAGES.value]
+    sbom_dict = {
+        SBoMComplianceTags.PACKAGES.value: [package.to_dict() if isinstance(package, NormalizedRecord) else package
+                                            for package in packages],
+    }
+    graph = sbom.get(SBoMComplianceTags.GRAPH.value)
+    if graph:
+        sbom_dict[SBoMComplianceTags.GRAPH.value] = graph if isinstance(graph, dict) else graph.to_dict()
+    return {
+        SBoMComplianceTags.META.value: normalized_sbom[SBoMComplianceTags.META.value],
+        SBoMComplianceTags.SBOM.value: sbom_dict,
+    }
+
+def normalized_sbom_from_dict(data):
+    """Returns the normalized SBoM, with records, from the dicts
+    returned by normalized_sbom_to_dict. Packages and dependencies not
+    written from records (e.g. from the native format) are kept as
+    dicts, with their fields in the same order."""
+    sbom = data[SBoMComplianceTags.SBOM.value]
+    dependencies = {}
+
+    def dependency(dep):
+        if tuple(dep) != NormalizedDependency._fields:
+            return dep
+        key = tuple(dep.values())
+        if key not in dependencies:
+            dependencies[key] = NormalizedDependency(*key)
+        return dependencies[key]
+
+    def package(package):
+        fields = tuple(package)
+        if fields != NormalizedPackage._fields and fields != NormalizedPackage._fields + (SBoMComplianceTags.REF.value,):
+            return package
+        return NormalizedPackage(package[SBoMComplianceTags.NAME.value],
+                                 package[SBoMComplianceTags.VERSION.value],
+                                 package[SBoMComplianceTags.LICENSE.value],
+                                 tuple(dependency(dep) for dep in package[SBoMComplianceTags.DEPENENCIES.value]),
+                                 package.get(SBoMComplianceTags.REF.value))
+
+    sbom_records = {
+        SBoMComplianceTags.PACKAGES.value: [package(p) for p in sbom[SBoMComplianceTags.PACKAGES.value]],
+    }
+    graph = sbom.get(SBoMComplianceTags.GRAPH.value)
+    if graph:
+        sbom_records[SBoMComplianceTags.GRAPH.value] = DependencyGraph.from_dict(graph)
+    return {
+        SBoMComplianceTags.META.value: data[SBoMComplianceTags.META.value],
+        SBoMComplianceTags.SBOM.value: sbom_records,
+    }
+
 class SBoMReader:
 
+    def __init__(self, options=None):
+        # reader specific options, e.g. 'low_memory'
+        self.options = options or {}
+        # dependencies already created, identical dependencies are shared
+        self._dependencies = {}
+
     def normalize_sbom_file(self, filename):
         return None
 
@@ -47,13 +191,19 @@ class SBoMReader:
             data = json.load(fp)
             return data
 
+    def _intern(self, value):
+        if isinstance(value, str):
+            return sys.intern(value)
+        return value
+
     def _sub_component(self, name, version, usecase, licenses):
-        return {
-            SBoMComplianceTags.NAME.value: name,
-            SBoMComplianceTags.VERSION.value: version,
-            SBoMComplianceTags.USECASE.value: usecase,
-            SBoMComplianceTags.LICENSE.value: self.summarize_licenses(licenses),
-        }
+        key = (name, version, usecase, self._intern(self.summarize_licenses(licenses)))
+        try:
+            return self._dependencies[key]
+        except KeyError:
+            dependency = NormalizedDependency(name, version, self._intern(usecase), key[3])
+            self._dependencies[key] = dependency
+            return dependency
 
     def _meta(self):
         return {
@@ -62,18 +212,37 @@ class SBoMReader:
             'original_format': self.supported_sbom(),
         }
 
-    def _component(self, name, version, licenses, dependencies):
-        return {
-            SBoMComplianceTags.NAME.value: name,
-            SBoMComplianceTags.VERSION.value: version,
-            SBoMComplianceTags.LICENSE.value: self.summarize_licenses(licenses),
-            SBoMComplianceTags.DEPENENCIES.value: dependencies,
-        }
+    def _component(self, name, version, licenses, dependencies, ref=None):
+        return NormalizedPackage(name,
+                                 version,
+                                 self._intern(self.summarize_licenses(licenses)),
+                                 tuple(dependencies),
+                                 ref)
+
+    def _dependency_graph(self):
+        """Whether or not to create the dependency graph"""
+        return self.options.get('dependency_graph', False)
 
-    def _pack_components(self, components):
+    def _add_unreachable(self, graph, top_ref, refs):
+        """Add the components (refs and their usecases) that can not be
+        reached from the top component as its direct dependencies, as
+        when all components are treated as dependencies of the top
+        component"""
+        reachable = graph.reachable(top_ref)
+        for ref, usecase in refs:
+            if ref not in reachable:
+                graph.add_edge(top_ref, ref, usecase)
+                graph.reachable(ref, reachable)
+
+    def _pack_components(self, components, graph=None):
+        # the SBoM is read, no more dependencies to share
+        self._dependencies = {}
+        sbom = {
+            SBoMComplianceTags.PACKAGES.value: components,
+        }
+        if graph:
+            sbom[SBoMComplianceTags.GRAPH.value] = graph
         return {
             SBoMComplianceTags.META.value: self._meta(),
-            SBoMComplianceTags.SBOM.value: {
-                SBoMComplianceTags.PACKAGES.value: components,
-            },
+            SBoMComplianceTags.SBOM.value: sbom,
         }
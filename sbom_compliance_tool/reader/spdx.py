@@ -7,18 +7,70 @@
 #
 
 import logging
+from collections import deque
 
+from sbom_compliance_tool.graph import DependencyGraph
+from sbom_compliance_tool.license_texts import LicenseTextLookup
+from sbom_compliance_tool.license_texts import text_key
 from sbom_compliance_tool.reader.sbom_reader import SBoMReader
 
 from licomp.interface import UseCase
-from lookup_license.lookuplicense import LookupLicense
 
 from spdx_tools.spdx.parser.parse_anything import parse_file
+from spdx_tools.spdx.parser.jsonlikedict.json_like_dict_parser import JsonLikeDictParser
+from spdx_tools.spdx.parser.tagvalue.parser import Parser as TagValueParser
 from spdx_tools.spdx.model.relationship import RelationshipType
 
-class SPDXSBoMReader(SBoMReader):
+# Relationships where the related element (spdx2) depends on the
+# element (spdx1), e.g. 'A DEPENDENCY_OF B'. The other relationships
+# are read as spdx1 depending on spdx2.
+INVERTED_RELATIONSHIPS = {
+    'ANCESTOR_OF',
+    'BUILD_DEPENDENCY_OF',
+    'BUILD_TOOL_OF',
+    'CONTAINED_BY',
+    'DATA_FILE_OF',
+    'DEPENDENCY_MANIFEST_OF',
+    'DEPENDENCY_OF',
+    'DESCRIBED_BY',
+    'DEV_DEPENDENCY_OF',
+    'DEV_TOOL_OF',
+    'DOCUMENTATION_OF',
+    'EXAMPLE_OF',
+    'GENERATES',
+    'METAFILE_OF',
+    'OPTIONAL_COMPONENT_OF',
+    'OPTIONAL_DEPENDENCY_OF',
+    'PACKAGE_OF',
+    'PATCH_FOR',
+    'PREREQUISITE_FOR',
+    'PROVIDED_DEPENDENCY_OF',
+    'REQUIREMENT_DESCRIPTION_FOR',
+    'RUNTIME_DEPENDENCY_OF',
+    'SPECIFICATION_FOR',
+    'TEST_CASE_OF',
+    'TEST_DEPENDENCY_OF',
+    'TEST_OF',
+    'TEST_TOOL_OF',
+}
 
-    def __init__(self):
+class SPDXSBoMReader(SBoMReader):
+    """Reads SPDX (JSON or tag-value) SBoMs.
+
+    The report is created for the root elements: the SPDXIDs in the
+    option 'spdx_roots' or, if not given, the elements the document
+    DESCRIBES. All elements reachable from a root, following the
+    relationships in the dependency direction, are its dependencies.
+    If there are no roots, or with the option 'spdx_all_packages' set,
+    every package is reported with its direct relationships (in both
+    directions) as dependencies.
+
+    With the option 'dependency_graph' set, the relationships are
+    read into a DependencyGraph, keyed by SPDXID.
+    """
+
+    def __init__(self, options=None):
+        SBoMReader.__init__(self, options)
         self.relationship_map_raw = {
             RelationshipType.AMENDS: UseCase.UNKNOWN,
             RelationshipType.ANCESTOR_OF: UseCase.UNKNOWN,
@@ -148,25 +200,109 @@ class SPDXSBoMReader(SBoMReader):
         packed_component = self._component(parsed_doc.object_name(package),
                                            parsed_doc.object_version(package),
                                            [],
-                                           packages)
+                                           packages,
+                                           package if self._dependency_graph() else None)
         return packed_component
 
+    def _adjacency(self, parsed_doc):
+        """Index of the relationships, in the dependency direction:
+        SPDXID -> list of (SPDXID depended on, relationship)"""
+        adjacency = {}
+        for relations in parsed_doc.rel_map.values():
+            for spdx1, rel, spdx2 in relations:
+                if spdx1.startswith('SPDXRef-DOCUMENT') or spdx2.startswith('SPDXRef-DOCUMENT'):
+                    continue
+                if rel in INVERTED_RELATIONSHIPS:
+                    spdx1, spdx2 = spdx2, spdx1
+                adjacency.setdefault(spdx1, []).append((spdx2, rel))
+        return adjacency
+
+    def _roots(self, parsed_doc):
+        roots = self.options.get('spdx_roots') or parsed_doc.described()
+        found = []
+        for root in dict.fromkeys(roots):
+            if parsed_doc.object(root):
+                found.append(root)
+            else:
+                logging.warning(f'Root element {root} not found in SPDX document')
+        return found
+
+    def _normalize_root(self, parsed_doc, adjacency, root):
+        """Normalize the root element, with all elements reachable
+        from it as dependencies (each one once, with the usecase of the
+        relationship it was first reached through)"""
+        packages = []
+        reached = {root}
+        queue = deque([root])
+        while queue:
+            for spdxid, rel in adjacency.get(queue.popleft(), []):
+                if spdxid in reached:
+                    continue
+                reached.add(spdxid)
+                queue.append(spdxid)
+                packages.append(self._normalize_sub_package(parsed_doc, root, rel, spdxid))
+
+        return self._component(parsed_doc.object_name(root),
+                               parsed_doc.object_version(root),
+                               [str(parsed_doc.object_license(root))],
+                               packages,
+                               root if self._dependency_graph() else None)
+
+    def _graph(self, parsed_doc, adjacency):
+        graph = DependencyGraph()
+        for spdxid in parsed_doc.packages() + parsed_doc.files():
+            graph.add_node(spdxid,
+                           parsed_doc.object_name(spdxid),
+                           parsed_doc.object_version(spdxid),
+                           self._intern(str(parsed_doc.object_license(spdxid))))
+        for spdxid, dependencies in adjacency.items():
+            for dependency, rel in dependencies:
+                graph.add_edge(spdxid, dependency, self._relationship_to_usecase(rel))
+        return graph
+
+    def _parsed_doc_class(self):
+        if self.options.get('fast_spdx'):
+            # avoid circular import, spdx_fast depends on this module
+            from sbom_compliance_tool.reader.spdx_fast import FastParsedSPDXDoc
+            return FastParsedSPDXDoc
+        return ParsedSPDXDoc
+
     def normalize_sbom_file(self, file_path):
         logging.info(f'Reading {file_path} as SPDX')
-        parsed = ParsedSPDXDoc(file_path)
+        parsed = self._parsed_doc_class()(file_path, license_texts=self.options.get('license_texts'))
         logging.info(f'Reading {file_path} as SPDX: parse OK')
+        return self._normalize_parsed(parsed)
 
-        packages = []
-        for package in parsed.packages():
-            normalized_package = self._normalize_package(parsed, package)
-            packages.append(normalized_package)
+    def _normalize_parsed(self, parsed):
+        adjacency = None
+        roots = []
+        if not self.options.get('spdx_all_packages'):
+            roots = self._roots(parsed)
+            if not roots:
+                logging.info('No root elements in SPDX document, reporting all packages')
 
-        top_components = self._pack_components(packages)
+        packages = []
+        if roots:
+            adjacency = self._adjacency(parsed)
+            for root in roots:
+                packages.append(self._normalize_root(parsed, adjacency, root))
+        else:
+            for package in parsed.packages():
+                normalized_package = self._normalize_package(parsed, package)
+                packages.append(normalized_package)
+
+        graph = None
+        if self._dependency_graph():
+            graph = self._graph(parsed, adjacency or self._adjacency(parsed))
+        top_components = self._pack_components(packages, graph)
         self._normalized_sbom = top_components
         return self._normalized_sbom
 
     def normalize_sbom_data(self, data):
-        return None
+        """Normalize SPDX data, either JSON (as a dict) or tag-value
+        (as a string)"""
+        parsed = self._parsed_doc_class()(data=data, license_texts=self.options.get('license_texts'))
+        return self._normalize_parsed(parsed)
 
     def normalized_sbom(self):
         return self._normalized_sbom
@@ -176,7 +312,7 @@ class SPDXSBoMReader(SBoMReader):
 
 class ParsedSPDXDoc:
 
-    def __init__(self, file_path):
+    def __init__(self, file_path=None, data=None, license_texts=None):
         self.rel_map = {}
         self.rel_map_inv = {}
         self.objects = {
@@ -184,14 +320,26 @@ class ParsedSPDXDoc:
             'files': {},
             'extracted_text': {},
         }
-        self.ll = LookupLicense()
-        self._read_spdx_sbom(file_path)
+        # LicenseTextLookup, possibly shared between documents
+        self.license_texts = license_texts or LicenseTextLookup()
+        if file_path:
+            self._read_spdx_sbom(file_path)
+        else:
+            self._read_spdx_data(data)
 
     def _read_spdx_sbom(self, file_path):
         self.doc = parse_file(file_path)
         self._update_relationships()
         self._update_objects()
 
+    def _read_spdx_data(self, data):
+        if isinstance(data, dict):
+            self.doc = JsonLikeDictParser().parse(data)
+        else:
+            self.doc = TagValueParser().parse(data)
+        self._update_relationships()
+        self._update_objects()
+
     def object_name(self, spdxid):
         obj = self.object(spdxid)
         if not obj:
@@ -235,6 +383,10 @@ class ParsedSPDXDoc:
                 return obj.license_concluded
         except Exception as e:
             logging.debug(f'object_licens raised an exception: {e}')
+        if spdxid in self.objects['files']:
+            # files only have a concluded license
+            logging.debug(f'No concluded license for file {spdxid}, returning empty string')
+            return ''
         license_declared = str(obj.license_declared)
         if license_declared != 'NOASSERTION':
             if license_declared.startswith('LicenseRef'):
@@ -262,6 +414,17 @@ class ParsedSPDXDoc:
         return (self.rel_map.get(spdxid, []),
                 self.rel_map_inv.get(spdxid, []))
 
+    def described(self):
+        """The SPDXIDs of the elements the document describes"""
+        described = []
+        for relations in self.rel_map.values():
+            for spdx1, rel, spdx2 in relations:
+                if rel == 'DESCRIBES' and spdx1.startswith('SPDXRef-DOCUMENT'):
+                    described.append(spdx2)
+                elif rel == 'DESCRIBED_BY' and spdx2.startswith('SPDXRef-DOCUMENT'):
+                    described.append(spdx1)
+        return described
+
     def spdx_file(self, spdxid):
         return self.objects['files'][spdxid]
 
@@ -296,15 +459,18 @@ class ParsedSPDXDoc:
         for snippet in self.doc.snippets:
             self.objects['snippets'][snippet.spdx_id] = snippet
 
+        self._update_extracted_texts((lic.license_id, lic.extracted_text) for lic in self.doc.extracted_licensing_info)
+
+    def _update_extracted_texts(self, extracted_licenses):
+        """Identify the licenses in extracted_licenses, tuples of license
+        id and extracted text. Identical texts are looked up once."""
         try:
-            for lic in self.doc.extracted_licensing_info:
-                lookedup = self.ll.lookup_license_text(lic.extracted_text)
-                identification = lookedup['identification']
-                if identification == 'flame':
-                    normalized_license = ' AND '.join(lookedup['normalized'])
-                else:
-                    normalized_license = ' AND '.join([x['license'] for x in lookedup['normalized']])
-                self.objects['extracted_text'][lic.license_id] = normalized_license
+            extracted_licenses = [(license_id, text) for license_id, text in extracted_licenses if text is not None]
+            licenses = self.license_texts.identify(text for license_id, text in extracted_licenses)
+            for license_id, extracted_text in extracted_licenses:
+                normalized_license = licenses.get(text_key(extracted_text))
+                if normalized_license is not None:
+                    self.objects['extracted_text'][license_id] = normalized_license
 
         except Exception as e:
             logging.debug(f'Updating objects raised an exception: {e}')
@@ -0,0 +1,202 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#
+# Fast, but limited, SPDX reading. Only the parts of the SPDX
+# document used by SPDXSBoMReader are read (packages, files,
+# relationships, licenses and extracted licensing info) and nothing is
+# validated. Supports SPDX JSON and tag-value, other formats are
+# read with spdx_tools.
+#
+
+import json
+import logging
+
+from license_expression import Licensing
+from license_expression import get_spdx_licensing
+
+from sbom_compliance_tool.reader.spdx import ParsedSPDXDoc
+
+NOASSERTION = 'NOASSERTION'
+NONE = 'NONE'
+DOCUMENT = 'document'
+PACKAGE = 'package'
+FILE = 'file'
+EXTRACTED_LICENSE = 'extracted_license'
+RELATIONSHIP = 'relationship'
+OTHER = 'other'
+
+# tag-value tags starting a new element
+TAG_VALUE_ELEMENTS = {
+    'PackageName': PACKAGE,
+    'FileName': FILE,
+    'LicenseID': EXTRACTED_LICENSE,
+    'Relationship': RELATIONSHIP,
+    'SnippetSPDXID': OTHER,
+    'Annotator': OTHER,
+    'Reviewer': OTHER,
+}
+
+class SPDXElement():
+    """The parts of an SPDX package or file used when normalizing"""
+
+    __slots__ = ['spdx_id', 'name', 'version', 'license_concluded', 'license_declared']
+
+    def __init__(self, spdx_id=None, name=None, version=None, license_concluded=None, license_declared=None):
+        self.spdx_id = spdx_id
+        self.name = name
+        self.version = version
+        self.license_concluded = license_concluded
+        self.license_declared = license_declared
+
+class FastParsedSPDXDoc(ParsedSPDXDoc):
+    """Drop-in replacement for ParsedSPDXDoc reading SPDX JSON and
+    tag-value without building the spdx_tools document model.
+
+    License expressions are rendered the same way as spdx_tools does
+    (JSON with Licensing, tag-value with the SPDX licensing), once per
+    distinct expression.
+    """
+
+    def __init__(self, file_path=None, data=None, license_texts=None):
+        self._licensing = Licensing()
+        self._spdx_licensing = None
+        self._license_strings = {}
+        ParsedSPDXDoc.__init__(self, file_path, data, license_texts)
+
+    def _read_spdx_sbom(self, file_path):
+        with open(file_path, encoding='utf-8') as fp:
+            content = fp.read()
+        stripped = content.lstrip()
+        if stripped.startswith('{'):
+            self._read_json(json.loads(content))
+        elif 'SPDXVersion:' in stripped[:4096]:
+            self._read_tag_value(content)
+        else:
+            logging.info(f'{file_path} is not SPDX JSON or tag-value, reading with spdx_tools')
+            ParsedSPDXDoc._read_spdx_sbom(self, file_path)
+
+    def _read_spdx_data(self, data):
+        if isinstance(data, dict):
+            self._read_json(data)
+        else:
+            self._read_tag_value(data)
+
+    def _license(self, expression, spdx_licensing):
+        if expression is None:
+            return None
+        if expression.upper() == NOASSERTION:
+            return NOASSERTION
+        if expression.upper() == NONE:
+            return NONE
+        key = (expression, spdx_licensing)
+        if key not in self._license_strings:
+            licensing = self._licensing
+            if spdx_licensing:
+                if not self._spdx_licensing:
+                    self._spdx_licensing = get_spdx_licensing()
+                licensing = self._spdx_licensing
+            self._license_strings[key] = str(licensing.parse(expression))
+        return self._license_strings[key]
+
+    #
+    # JSON
+    #
+    def _read_json(self, doc):
+        for pkg in doc.get('packages', []):
+            self.objects['packages'][pkg['SPDXID']] = SPDXElement(pkg['SPDXID'],
+                                                                  pkg.get('name'),
+                                                                  pkg.get('versionInfo'),
+                                                                  self._license(pkg.get('licenseConcluded'), False),
+                                                                  self._license(pkg.get('licenseDeclared'), False))
+        for fil in doc.get('files', []):
+            self.objects['files'][fil['SPDXID']] = SPDXElement(fil['SPDXID'],
+                                                               fil.get('fileName'),
+                                                               '',
+                                                               self._license(fil.get('licenseConcluded'), False))
+
+        # Same order as spdx_tools: relationships, document describes
+        # and then package has files
+        existing = set()
+        for rel in doc.get('relationships', []):
+            rel_type = rel['relationshipType'].replace('-', '_').upper()
+            self._update_rel_maps(rel['spdxElementId'], rel_type, rel['relatedSpdxElement'])
+            existing.add((rel['spdxElementId'], rel_type, rel['relatedSpdxElement']))
+
+        doc_id = doc.get('SPDXID')
+        for described in dict.fromkeys(doc.get('documentDescribes', [])):
+            self._add_implicit_relationship(doc_id, 'DESCRIBES', described, 'DESCRIBED_BY', existing)
+
+        existing_has_files = set(existing)
+        for pkg in doc.get('packages', []):
+            for fil in dict.fromkeys(pkg.get('hasFiles', [])):
+                self._add_implicit_relationship(pkg['SPDXID'], 'CONTAINS', fil, 'CONTAINED_BY', existing_has_files)
+
+        self._update_extracted_texts((lic['licenseId'], lic['extractedText']) for lic in doc.get('hasExtractedLicensingInfos', []))
+
+    def _add_implicit_relationship(self, spdx1, rel, spdx2, inverted_rel, existing):
+        if (spdx1, rel, spdx2) in existing or (spdx2, inverted_rel, spdx1) in existing:
+            return
+        self._update_rel_maps(spdx1, rel, spdx2)
+
+    #
+    # Tag-value
+    #
+    def _tag_values(self, content):
+        lines = iter(content.splitlines())
+        for line in lines:
+            if not line or line.startswith('#') or ':' not in line:
+                continue
+            tag, value = line.split(':', 1)
+            value = value.strip()
+            if value.startswith('<text>'):
+                text_lines = [value[len('<text>'):]]
+                while '</text>' not in text_lines[-1]:
+                    try:
+                        text_lines.append(next(lines))
+                    except StopIteration:
+                        break
+                value = '\n'.join(text_lines).split('</text>', 1)[0]
+            yield tag.strip(), value
+
+    def _read_tag_value(self, content):
+        elements = []
+        current = {'kind': DOCUMENT}
+        for tag, value in self._tag_values(content):
+            kind = TAG_VALUE_ELEMENTS.get(tag)
+            if kind:
+                elements.append(current)
+                current = {'kind': kind}
+            current.setdefault(tag, value)
+        elements.append(current)
+
+        extracted_licenses = []
+        existing = set()
+        last_package = None
+        for element in elements:
+            kind = element['kind']
+            if kind == PACKAGE:
+                last_package = element['SPDXID']
+                self.objects['packages'][last_package] = SPDXElement(last_package,
+                                                                     element.get('PackageName'),
+                                                                     element.get('PackageVersion'),
+                                                                     self._license(element.get('PackageLicenseConcluded'), True),
+                                                                     self._license(element.get('PackageLicenseDeclared'), True))
+            elif kind == FILE:
+                self.objects['files'][element['SPDXID']] = SPDXElement(element['SPDXID'],
+                                                                       element.get('FileName'),
+                                                                       '',
+                                                                       self._license(element.get('LicenseConcluded'), True))
+                # files after a package are contained by the package
+                if last_package and (last_package, 'CONTAINS', element['SPDXID']) not in existing:
+                    self._update_rel_maps(last_package, 'CONTAINS', element['SPDXID'])
+                    existing.add((last_package, 'CONTAINS', element['SPDXID']))
+            elif kind == RELATIONSHIP:
+                spdx1, rel, spdx2 = element['Relationship'].split()
+                self._update_rel_maps(spdx1, rel, spdx2)
+                existing.add((spdx1, rel, spdx2))
+            elif kind == EXTRACTED_LICENSE:
+                extracted_licenses.append((element['LicenseID'], element.get('ExtractedText')))
+
+        self._update_extracted_texts(extracted_licenses)
@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from sbom_compliance_tool.reader.sbom_reader import normalized_sbom_from_dict
+from sbom_compliance_tool.reader.sbom_reader import normalized_sbom_to_dict
+
+NORMALIZED_CACHE_DIR = 'normalized'
+# in MB
+DEFAULT_NORMALIZED_CACHE_SIZE = 512
+
+ENTRY_SUFFIX = '.json'
+# entries written by earlier versions, never read
+OBSOLETE_ENTRY_SUFFIX = '.pickle'
+
+class NormalizedSBoMCache():
+    """Content addressed cache, in a directory, of normalized SBoMs.
+
+    An entry is keyed by the sha256 of the SBoM file's bytes, the
+    version (of the tool and of the license identification) and the
+    reader options. The entries are stored as JSON, so reading a
+    cache directory shared with others can not run any code. When the
+    files in the directory take more than max_size bytes, the least
+    recently used entries (by modification time, updated on each hit)
+    are removed.
+    """
+
+    def __init__(self, directory, version, max_size):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.version = version
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._remove_obsolete()
+
+    def _remove_obsolete(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(OBSOLETE_ENTRY_SUFFIX):
+                logging.debug(f'Removing obsolete cached normalized SBoM {entry.path}')
+                self._remove(entry.path)
+
+    def key(self, file_path, options):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(1 << 20), b''):
+                digest.update(chunk)
+        return self._key(digest, options)
+
+    def data_key(self, data, options):
+        """Key for SBoM data, bytes or a string, same as the key for a
+        file with the data"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return self._key(hashlib.sha256(data), options)
+
+    def _key(self, digest, options):
+        content = digest.hexdigest()
+        settings = json.dumps({'version': self.version, 'options': options}, sort_keys=True)
+        return f'{content}-{hashlib.sha256(settings.encode("utf-8")).hexdigest()[:16]}'
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}{ENTRY_SUFFIX}')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as fp:
+                normalized_sbom = normalized_sbom_from_dict(json.load(fp))
+            # mark the entry as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            normalized_sbom = None
+        except Exception as e:
+            logging.debug(f'Failed reading cached normalized SBoM {path}, removing it. Exception: {e}')
+            self._remove(path)
+            normalized_sbom = None
+        with self._lock:
+            if normalized_sbom is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return normalized_sbom
+
+    def put(self, key, normalized_sbom):
+        if self.max_size <= 0:
+            return
+        # write to a temporary file first, readers never see half written entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                json.dump(normalized_sbom_to_dict(normalized_sbom), fp, separators=(',', ':'))
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            self._remove(tmp_path)
+            raise
+        self._evict()
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        with self._lock:
+            entries = sorted(self._entries())
+            size = sum(entry[1] for entry in entries)
+            for mtime, entry_size, path in entries:
+                if size <= self.max_size:
+                    break
+                self._remove(path)
+                size -= entry_size
+                self.evictions += 1
+
+    def _remove(self, path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            for mtime, size, path in self._entries():
+                self._remove(path)
+
+    def stats(self):
+        return {
+            'path': self.directory,
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
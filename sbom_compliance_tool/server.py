@@ -0,0 +1,199 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from sbom_compliance_tool.config import sbom_compliance_tool_version
+from sbom_compliance_tool.format import SBoMReportFormatterFactory
+from sbom_compliance_tool.format import DEFAULT_FORMAT
+from sbom_compliance_tool.format import CONTENT_TYPES
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+# nr of connections waiting to be accepted, ThreadingHTTPServer's
+# default (5) resets connections when many clients post at once
+REQUEST_QUEUE_SIZE = 128
+
+# nr of latencies to keep when calculating percentiles
+LATENCY_WINDOW = 1000
+
+class ServerMetrics():
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def add(self, latency, failed=False):
+        with self._lock:
+            self.requests += 1
+            if failed:
+                self.errors += 1
+            self.latencies.append(latency)
+
+    def _percentile(self, latencies, percent):
+        index = min(len(latencies) - 1, int(len(latencies) * percent / 100))
+        return latencies[index]
+
+    def latency(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return {
+                'count': 0,
+            }
+        return {
+            'count': len(latencies),
+            'mean': sum(latencies) / len(latencies),
+            'min': latencies[0],
+            'max': latencies[-1],
+            'p50': self._percentile(latencies, 50),
+            'p95': self._percentile(latencies, 95),
+            'p99': self._percentile(latencies, 99),
+        }
+
+    def metrics(self):
+        with self._lock:
+            requests = self.requests
+            errors = self.errors
+        return {
+            'uptime': time.time() - self.started,
+            'requests': requests,
+            'errors': errors,
+            'latency': self.latency(),
+        }
+
+class SBoMComplianceHTTPServer(ThreadingHTTPServer):
+    """Handles each request in a thread of its own"""
+
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+class SBoMComplianceServer():
+    """Keeps the compliance tool (SBoMComplianceTool, with its reader
+    options and normalized SBoM cache) and the compatibility checker,
+    with its license databases and caches, in memory and verifies
+    SBoMs posted over HTTP.
+
+    Endpoints:
+    * POST /verify - verify the SBoM in the request body, the output
+      format can be set with the query parameter 'format'
+    * GET /health - status and version
+    * GET /metrics - request counts, latencies and cache statistics
+    """
+
+    def __init__(self, compliance, compatibility, resources, usecase, provisioning, modified):
+        self.compliance = compliance
+        self.compatibility = compatibility
+        self.resources = resources
+        self.usecase = usecase
+        self.provisioning = provisioning
+        self.modified = modified
+        self.metrics = ServerMetrics()
+
+    def verify(self, data):
+        normalized_sbom = self.compliance.from_sbom_data(data)
+        if not normalized_sbom:
+            return None
+        return self.compatibility.compatibility_report(normalized_sbom,
+                                                       self.usecase,
+                                                       self.provisioning,
+                                                       self.modified,
+                                                       self.resources)
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'version': sbom_compliance_tool_version,
+        }
+
+    def all_metrics(self):
+        metrics = self.metrics.metrics()
+        metrics['cache'] = self.compatibility.cache_stats()
+        if self.compliance.sbom_cache:
+            metrics['normalized_sbom_cache'] = self.compliance.sbom_cache.stats()
+        return metrics
+
+    def prepare(self):
+        """Load the readers and license databases before serving, so
+        the first request is not slower than the rest"""
+        logging.info('Preparing the server')
+        self.compliance.prepare()
+        self.compatibility.prepare()
+
+    def http_server(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return SBoMComplianceHTTPServer((host, port), _handler_class(self))
+
+    def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = self.http_server(host, port)
+        self.prepare()
+        logging.info(f'Serving on http://{host}:{server.server_port}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logging.info('Stopping server')
+        finally:
+            server.server_close()
+
+def _handler_class(compliance_server):
+
+    class SBoMComplianceRequestHandler(BaseHTTPRequestHandler):
+
+        def _reply(self, status, content, content_type='application/json'):
+            body = content.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _reply_json(self, status, data):
+            self._reply(status, json.dumps(data, indent=4))
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == '/health':
+                self._reply_json(200, compliance_server.health())
+            elif path == '/metrics':
+                self._reply_json(200, compliance_server.all_metrics())
+            else:
+                self._reply_json(404, {'error': f'No such resource: {path}'})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path != '/verify':
+                self._reply_json(404, {'error': f'No such resource: {url.path}'})
+                return
+
+            start = time.perf_counter()
+            failed = True
+            try:
+                output_format = parse_qs(url.query).get('format', [DEFAULT_FORMAT])[0]
+                formatter = SBoMReportFormatterFactory.formatter(output_format)
+                length = int(self.headers.get('Content-Length', 0))
+                report = compliance_server.verify(self.rfile.read(length))
+                if not report:
+                    self._reply_json(400, {'error': 'Failed reading SBoM'})
+                else:
+                    self._reply(200, formatter.format(report), CONTENT_TYPES[output_format.lower()])
+                    failed = False
+            except Exception as e:
+                logging.warning(f'Failed verifying SBoM. Exception: {e}')
+                self._reply_json(500, {'error': str(e)})
+            compliance_server.metrics.add(time.perf_counter() - start, failed)
+
+        def log_message(self, format, *args):
+            logging.info(f'{self.address_string()} {format % args}')
+
+    return SBoMComplianceRequestHandler
@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from licomp.interface import UseCase
+from licomp.interface import Provisioning
+from licomp.interface import Modification
+from licomp_toolkit.utils import default_resources
+
+from sbom_compliance_tool.cache import DEFAULT_CACHE_SIZE
+from sbom_compliance_tool.compatibility import SBoMCompatibility
+from sbom_compliance_tool.compliance_tool import SBoMComplianceTool
+from sbom_compliance_tool.license_texts import LicenseTextLookup
+from sbom_compliance_tool.timings import Timings
+
+class VerificationSession():
+    """Verifies SBoMs, for use when embedding the tool in a program.
+
+    The reader, flame and licomp are set up once, when the session is
+    created, and the caches (compatibility verdicts, identified
+    licenses and license texts) are shared by all verifications. The
+    verify methods can be called from several threads at the same
+    time, each call reads the SBoM with readers of its own.
+
+        session = VerificationSession()
+        report = session.verify_file('sbom.json')
+
+    The reports are the same as the JSON reports from the command line
+    tool, None if the SBoM could not be read.
+    """
+
+    def __init__(self,
+                 resources=None,
+                 usecase=None,
+                 provisioning=None,
+                 modified=None,
+                 reader_options=None,
+                 cache_size=DEFAULT_CACHE_SIZE,
+                 store=None,
+                 matrix=None,
+                 sbom_cache=None,
+                 tiered=False,
+                 timings=None):
+        self.resources = list(resources or default_resources())
+        self.usecase = usecase or UseCase.usecase_to_string(UseCase.LIBRARY)
+        self.provisioning = provisioning or Provisioning.provisioning_to_string(Provisioning.BIN_DIST)
+        self.modified = modified or Modification.modification_to_string(Modification.UNMODIFIED)
+        self.timings = timings or Timings()
+
+        options = dict(reader_options or {})
+        # shared by all SBoMs read, identical license texts are looked up once
+        options.setdefault('license_texts', LicenseTextLookup(timings=self.timings))
+        self.license_texts = options['license_texts']
+        self.compliance = SBoMComplianceTool(options, self.timings, sbom_cache)
+        self.compatibility = SBoMCompatibility(cache_size, store, self.timings, matrix, tiered)
+        self.compatibility.prepare()
+
+    def _verify(self, normalized_sbom):
+        if not normalized_sbom:
+            return None
+        return self.compatibility.compatibility_report(normalized_sbom,
+                                                       self.usecase,
+                                                       self.provisioning,
+                                                       self.modified,
+                                                       self.resources)
+
+    def verify_data(self, data):
+        """Verify an SBoM, as bytes or a string, in any of the supported
+        formats"""
+        return self._verify(self.compliance.from_sbom_data(data))
+
+    def verify_file(self, path):
+        """Verify the SBoM in the file path"""
+        return self._verify(self.compliance.from_sbom_file(path))
+
+    def stats(self):
+        stats = {
+            'compatibility': self.compatibility.cache_stats(),
+            'license_texts': self.license_texts.stats(),
+        }
+        if self.compliance.sbom_cache:
+            stats['normalized_sbom_cache'] = self.compliance.sbom_cache.stats()
+        return stats
@@ -0,0 +1,90 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from sbom_compliance_tool.config import program_name
+
+COMPATIBILITY_STORE_FILE = 'compatibility.sqlite'
+
+def default_cache_dir():
+    cache_home = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(cache_home, program_name)
+
+class CompatibilityStore():
+    """Persistent store, using SQLite, for compatibility verdicts.
+
+    All entries are tied to the version string (the versions of
+    licomp_toolkit and its resources). If the store is opened with
+    another version the stored verdicts are dropped.
+    """
+
+    def __init__(self, path, version):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._create_tables()
+        self._check_version()
+
+    def _create_tables(self):
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS compatibility ('
+                                     'outbound TEXT, inbound TEXT, usecase TEXT, provisioning TEXT, resources TEXT, '
+                                     'verdict TEXT, '
+                                     'PRIMARY KEY (outbound, inbound, usecase, provisioning, resources))')
+
+    def _check_version(self):
+        row = self._connection.execute('SELECT value FROM meta WHERE key = ?', ('version',)).fetchone()
+        if row and row[0] == self.version:
+            return
+        if row:
+            logging.info(f'Compatibility store {self.path} created with other resource versions, clearing it')
+        with self._connection:
+            self._connection.execute('DELETE FROM compatibility')
+            self._connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', ('version', self.version))
+
+    def _row_key(self, key):
+        outbound, inbound, usecase, provisioning, resources = key
+        return (outbound, inbound, usecase, provisioning, ','.join(resources))
+
+    def get(self, key):
+        with self._lock:
+            row = self._connection.execute('SELECT verdict FROM compatibility WHERE '
+                                           'outbound = ? AND inbound = ? AND usecase = ? AND provisioning = ? AND resources = ?',
+                                           self._row_key(key)).fetchone()
+            if not row:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        with self._lock, self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO compatibility VALUES (?, ?, ?, ?, ?, ?)',
+                                     self._row_key(key) + (json.dumps(value),))
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM compatibility')
+
+    def close(self):
+        self._connection.close()
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import contextlib
+import threading
+import time
+
+class Timings():
+    """Wall and CPU time per stage, and counters.
+
+    Stages can be nested, the time of a stage does not include the time
+    of the stages inside it. E.g. the time spent in 'licomp' while
+    creating the report is not counted as 'compatibility'.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started = time.perf_counter()
+        self.started_cpu = time.process_time()
+        self.stages = {}
+        self.counters = {}
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        stack = self._stack()
+        # time spent in stages inside this stage
+        stack.append([0.0, 0.0])
+        start = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - start_cpu
+            nested_wall, nested_cpu = stack.pop()
+            if stack:
+                stack[-1][0] += wall
+                stack[-1][1] += cpu
+            with self._lock:
+                stage = self.stages.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'count': 0})
+                stage['wall'] += wall - nested_wall
+                stage['cpu'] += cpu - nested_cpu
+                stage['count'] += 1
+
+    def iterate(self, name, iterable):
+        """Yield the items in iterable, timing the creation of each
+        item as the stage name"""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_counters(self, name, counters):
+        """Set counters collected elsewhere, e.g. cache statistics"""
+        with self._lock:
+            self.counters[name] = counters
+
+    def report(self):
+        with self._lock:
+            return {
+                'total': {
+                    'wall': time.perf_counter() - self.started,
+                    'cpu': time.process_time() - self.started_cpu,
+                },
+                'stages': {name: dict(stage) for name, stage in self.stages.items()},
+                'counters': dict(self.counters),
+            }
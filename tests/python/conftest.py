@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Fixtures shared by the tests: the example SBoMs, the resources and
+checks used and helpers reading SBoMs, checking them and running the
+tool"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from sbom_compliance_tool.__main__ import default_checks
+from sbom_compliance_tool.compatibility import SBoMCompatibility
+from sbom_compliance_tool.compliance_tool import SBoMComplianceTool
+
+EXAMPLE_DATA = os.path.join(os.path.dirname(__file__), '..', '..', 'example-data')
+
+# resources available without network access, and fast
+RESOURCES = ['licomp_reclicense', 'licomp_osadl']
+
+@pytest.fixture(scope='session')
+def example():
+    """Returns the path to a file in example-data"""
+    def example_path(file_name):
+        return os.path.join(EXAMPLE_DATA, file_name)
+    return example_path
+
+@pytest.fixture(scope='session')
+def cyclonedx_json(example):
+    return example('example-project.cdx.json')
+
+@pytest.fixture(scope='session')
+def spdx_json(example):
+    return example('example-project.spdx.json')
+
+@pytest.fixture(scope='session')
+def normalized_json(example):
+    return example('normalized-project.json')
+
+@pytest.fixture(scope='session')
+def resources():
+    return list(RESOURCES)
+
+@pytest.fixture(scope='session')
+def checks():
+    """The usecase, provisioning and modification checked by the tool"""
+    return default_checks()
+
+@pytest.fixture(scope='session')
+def read_sbom():
+    """Returns the normalized SBoM in a file, read with the reader
+    options"""
+    def read(file_path, options=None):
+        return SBoMComplianceTool(options).from_sbom_file(file_path)
+    return read
+
+@pytest.fixture(scope='session')
+def check_sbom(checks):
+    """Checks a normalized SBoM with RESOURCES (unless other resources
+    are given), returns the report and the SBoMCompatibility used"""
+    def check(normalized_sbom, compatibility=None, resources=RESOURCES, **kwargs):
+        compatibility = compatibility or SBoMCompatibility()
+        return compatibility.compatibility_report(normalized_sbom, *checks, resources, **kwargs), compatibility
+    return check
+
+@pytest.fixture(scope='session')
+def run_tool():
+    """Runs the tool, without caches and with RESOURCES, with the
+    arguments. Returns the CompletedProcess."""
+    def run(args, **kwargs):
+        command = [sys.executable, '-m', 'sbom_compliance_tool', '--no-cache']
+        for resource in RESOURCES:
+            command += ['-r', resource]
+        return subprocess.run(command + list(args), **kwargs)
+    return run
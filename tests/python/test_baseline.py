@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+
+import pytest
+
+from sbom_compliance_tool.baseline import ReportBaseline
+from sbom_compliance_tool.format import SBoMReportFormatterFactory
+from sbom_compliance_tool.reader.sbom_reader import normalized_sbom_to_dict
+
+def as_written(report):
+    """The JSON report, as written by the tool and read back"""
+    return json.loads(SBoMReportFormatterFactory.formatter('json').format(report))
+
+@pytest.fixture
+def changed_sbom(read_sbom, cyclonedx_json):
+    """The example SBoM, with one dependency changed and one added"""
+    sbom = normalized_sbom_to_dict(read_sbom(cyclonedx_json))
+    dependencies = sbom['sbom']['packages'][0]['dependencies']
+    for dep in dependencies:
+        if dep['name'] == 'Example Sub Project AAA':
+            dep['license'] = 'MIT'
+    dependencies.append({
+        'name': 'Example Sub Project GGG',
+        'version': '1.2',
+        'usecase': 'library',
+        'license': 'Zlib',
+    })
+    return sbom
+
+@pytest.fixture
+def baseline_file(run_tool, cyclonedx_json, tmp_path):
+    """The JSON report of the example SBoM, written by the tool"""
+    path = tmp_path / 'baseline.json'
+    run_tool(['-of', 'json', 'verify', '-o', str(path), cyclonedx_json], check=True)
+    return path
+
+def test_baseline_reuse(read_sbom, check_sbom, cyclonedx_json, changed_sbom):
+    baseline = ReportBaseline(as_written(check_sbom(read_sbom(cyclonedx_json))[0]))
+
+    report, compatibility = check_sbom(changed_sbom, baseline=baseline)
+    assert (baseline.reused, baseline.evaluated) == (5, 2)
+    # only the changed and added dependencies are checked
+    assert compatibility.licomp_calls == 2
+    assert as_written(report) == as_written(check_sbom(changed_sbom)[0])
+
+    changes = baseline.changes(changed_sbom)
+    assert changes['verdicts'] == {'reused': 5, 'evaluated': 2}
+    assert changes['dependencies']['unchanged'] == 5
+    assert [entry['dependency'] for entry in changes['dependencies']['changed']] == ['Example Sub Project AAA']
+    assert [entry['dependency'] for entry in changes['dependencies']['added']] == ['Example Sub Project GGG']
+    assert changes['dependencies']['removed'] == []
+
+def test_baseline_other_resources_not_reused(read_sbom, check_sbom, cyclonedx_json):
+    baseline_report = as_written(check_sbom(read_sbom(cyclonedx_json))[0])
+    for dep in baseline_report['packages'][0]['dependencies']:
+        if dep['compatibility'] != 'missing-license':
+            dep['compatibility_details']['resources'] = ['licomp_other']
+    baseline = ReportBaseline(baseline_report)
+    check_sbom(read_sbom(cyclonedx_json), baseline=baseline)
+    # only the dependencies missing a license are reused
+    assert (baseline.reused, baseline.evaluated) == (2, 4)
+
+def test_changes_file(run_tool, baseline_file, changed_sbom, tmp_path):
+    sbom_file = tmp_path / 'sbom.json'
+    changes_file = tmp_path / 'changes.json'
+    sbom_file.write_text(json.dumps(changed_sbom))
+
+    result = run_tool(['-of', 'json', '--timings', 'verify', '--baseline', str(baseline_file), '--changes', str(changes_file), str(sbom_file)],
+                      check=True, capture_output=True, text=True)
+    changes = json.loads(changes_file.read_text())
+    assert changes['verdicts'] == {'reused': 5, 'evaluated': 2}
+    # stderr only has the timings
+    assert 'counters' in json.loads(result.stderr)
+
+def test_changes_on_stderr(run_tool, baseline_file, cyclonedx_json, tmp_path):
+    result = run_tool(['-of', 'json', 'verify', '--baseline', str(baseline_file), '-o', str(tmp_path / 'report.json'), cyclonedx_json],
+                      check=True, capture_output=True, text=True)
+    changes = json.loads(result.stderr)
+    assert changes['verdicts'] == {'reused': 6, 'evaluated': 0}
+
+@pytest.mark.parametrize('content, error', [
+    (None, 'Failed reading baseline'),
+    ('not JSON', 'Failed reading baseline'),
+    ('[1, 2]', 'is not a JSON compatibility report'),
+])
+def test_invalid_baseline(run_tool, cyclonedx_json, tmp_path, content, error):
+    baseline_file = tmp_path / 'baseline.json'
+    if content is not None:
+        baseline_file.write_text(content)
+    result = run_tool(['verify', '--baseline', str(baseline_file), cyclonedx_json], capture_output=True, text=True)
+    assert result.returncode == 1
+    assert error in result.stderr
+    assert 'Traceback' not in result.stderr
@@ -0,0 +1,36 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from sbom_compliance_tool.__main__ import expand_sbom_files
+
+def test_expand_directory_and_glob(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    for name in ['b.json', 'a.json', 'sub/c.json']:
+        (tmp_path / name).write_text('{}')
+    sbom_files, batch, empty = expand_sbom_files([str(tmp_path)])
+    assert sbom_files == [str(tmp_path / name) for name in ['a.json', 'b.json', 'sub/c.json']]
+    assert batch and not empty
+
+    sbom_files, batch, empty = expand_sbom_files([str(tmp_path / '*.json')])
+    assert sbom_files == [str(tmp_path / 'a.json'), str(tmp_path / 'b.json')]
+    assert batch and not empty
+
+def test_expand_single_file(normalized_json):
+    assert expand_sbom_files([normalized_json]) == ([normalized_json], False, [])
+
+def test_expand_empty(tmp_path):
+    pattern = str(tmp_path / '*.json')
+    assert expand_sbom_files([str(tmp_path), pattern]) == ([], True, [str(tmp_path), pattern])
+
+@pytest.mark.parametrize('with_file', [False, True])
+@pytest.mark.parametrize('empty', ['', '*.json'])
+def test_verify_empty_fails(run_tool, normalized_json, tmp_path, with_file, empty):
+    paths = [str(tmp_path / empty)]
+    if with_file:
+        paths.insert(0, normalized_json)
+    result = run_tool(['verify'] + paths, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert 'No SBoM files found in' in result.stderr
@@ -0,0 +1,43 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from sbom_compliance_tool.cache import CompatibilityCache
+
+def key(inbound):
+    return CompatibilityCache.compatibility_key('MIT', inbound, 'library', 'binary-distribution', ['b', 'a'])
+
+def test_key_independent_of_resource_order():
+    assert key('MIT') == CompatibilityCache.compatibility_key('MIT', 'MIT', 'library', 'binary-distribution', ['a', 'b'])
+
+def test_least_recently_used_evicted():
+    cache = CompatibilityCache(2)
+    cache.put(key('A'), {'compatibility': 'yes'})
+    cache.put(key('B'), {'compatibility': 'no'})
+    # A is now used more recently than B
+    assert cache.get(key('A')) == {'compatibility': 'yes'}
+    cache.put(key('C'), {'compatibility': 'depends'})
+
+    assert cache.get(key('B')) is None
+    assert cache.get(key('A')) == {'compatibility': 'yes'}
+    assert cache.get(key('C')) == {'compatibility': 'depends'}
+    assert cache.stats() == {
+        'size': 2,
+        'max_size': 2,
+        'hits': 3,
+        'misses': 1,
+        'evictions': 1,
+    }
+
+def test_peek_not_counted():
+    cache = CompatibilityCache(2)
+    cache.put(key('A'), {'compatibility': 'yes'})
+    assert cache.peek(key('A')) == {'compatibility': 'yes'}
+    assert cache.peek(key('B')) is None
+    assert (cache.hits, cache.misses) == (0, 0)
+
+def test_disabled():
+    cache = CompatibilityCache(0)
+    cache.put(key('A'), {'compatibility': 'yes'})
+    assert cache.get(key('A')) is None
+    assert len(cache) == 0
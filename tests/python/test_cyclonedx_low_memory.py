@@ -0,0 +1,37 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+
+import pytest
+
+from sbom_compliance_tool.reader.cyclonedx import CyclonedxSBoMReader
+from sbom_compliance_tool.reader.sbom_reader import normalized_sbom_to_dict
+
+CYCLONEDX_FILES = ['example-project.cdx.json', 'example-project.cdx.xml']
+
+def normalize_file(file_path, options):
+    reader = CyclonedxSBoMReader(options)
+    reader.normalize_sbom_file(file_path)
+    return normalized_sbom_to_dict(reader.normalized_sbom())
+
+@pytest.mark.parametrize('file_name', CYCLONEDX_FILES)
+@pytest.mark.parametrize('dependency_graph', [False, True])
+def test_low_memory_same_as_bom(example, file_name, dependency_graph):
+    file_path = example(file_name)
+    options = {'dependency_graph': dependency_graph}
+    assert normalize_file(file_path, dict(options, low_memory=True)) == normalize_file(file_path, options)
+
+@pytest.mark.parametrize('dependency_graph', [False, True])
+def test_low_memory_data_same_as_bom(cyclonedx_json, dependency_graph):
+    with open(cyclonedx_json) as fp:
+        data = json.load(fp)
+    options = {'dependency_graph': dependency_graph}
+    low_memory = CyclonedxSBoMReader(dict(options, low_memory=True))
+    low_memory.normalize_sbom_data(data)
+    assert normalized_sbom_to_dict(low_memory.normalized_sbom()) == normalize_file(cyclonedx_json, options)
+
+def test_json_same_as_xml(example):
+    json_file, xml_file = [example(file_name) for file_name in CYCLONEDX_FILES]
+    assert normalize_file(json_file, {'low_memory': True}) == normalize_file(xml_file, {'low_memory': True})
@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from sbom_compliance_tool.reader.detector import SBoMFormatDetector
+from sbom_compliance_tool.reader.detector import FORMAT_CYCLONEDX
+from sbom_compliance_tool.reader.detector import FORMAT_NATIVE
+from sbom_compliance_tool.reader.detector import FORMAT_SPDX
+
+EXAMPLES = [
+    ('normalized-project.json', FORMAT_NATIVE, dict),
+    ('example-project.cdx.json', FORMAT_CYCLONEDX, dict),
+    ('example-project.cdx.xml', FORMAT_CYCLONEDX, None),
+    ('example-project.spdx.json', FORMAT_SPDX, dict),
+    ('example-project.spdx', FORMAT_SPDX, str),
+]
+
+@pytest.mark.parametrize('file_name,sbom_format,data_type', EXAMPLES)
+def test_detect_file(example, file_name, sbom_format, data_type):
+    detected, data = SBoMFormatDetector().detect_file(example(file_name))
+    assert detected == sbom_format
+    if data_type:
+        assert isinstance(data, data_type)
+    else:
+        # parsed XML
+        assert data.tag.endswith('bom')
+
+@pytest.mark.parametrize('file_name,sbom_format,data_type', EXAMPLES)
+def test_detect_head_only(example, file_name, sbom_format, data_type):
+    assert SBoMFormatDetector().detect_file(example(file_name), head_only=True) == (sbom_format, None)
+
+@pytest.mark.parametrize('file_name,sbom_format,data_type', EXAMPLES)
+def test_detect_data(example, file_name, sbom_format, data_type):
+    with open(example(file_name), 'rb') as fp:
+        raw = fp.read()
+    assert SBoMFormatDetector().detect_data(raw)[0] == sbom_format
+    assert SBoMFormatDetector().detect_data(raw.decode('utf-8'))[0] == sbom_format
+
+@pytest.mark.parametrize('data,sbom_format', [
+    (b'\xef\xbb\xbf{"bomFormat": "CycloneDX", "specVersion": "1.5"}', FORMAT_CYCLONEDX),
+    ('<rdf:RDF xmlns:spdx="http://spdx.org/rdf/terms#"></rdf:RDF>', FORMAT_SPDX),
+    ('spdxVersion: SPDX-2.3\n', FORMAT_SPDX),
+    ('{"name": "not an SBoM"}', None),
+    ('{"bomFormat": ', None),
+    ('<html></html>', None),
+    ('[1, 2, 3]', None),
+    ('just some text', None),
+])
+def test_detect_sniffing(data, sbom_format):
+    assert SBoMFormatDetector().detect_data(data)[0] == sbom_format
@@ -0,0 +1,37 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+
+import pytest
+
+@pytest.fixture
+def fail_on(run_tool, tmp_path):
+    """Runs the tool with --fail-on, returns the exit code and the report"""
+    def run(level, sbom_file):
+        report_file = tmp_path / 'report.json'
+        result = run_tool(['verify', '--fail-on', level, '-o', str(report_file), sbom_file])
+        return result.returncode, json.loads(report_file.read_text())
+    return run
+
+@pytest.mark.parametrize('level', ['no', 'missing-license'])
+def test_passed(fail_on, normalized_json, level):
+    returncode, report = fail_on(level, normalized_json)
+    assert returncode == 0
+    assert report['status'] == 'passed'
+    assert report['checked'] == report['checks'] == 2
+    assert report['offending'] == []
+
+def test_failed(fail_on, normalized_json):
+    returncode, report = fail_on('yes', normalized_json)
+    assert returncode == 1
+    assert report['status'] == 'failed'
+    assert report['offending'][0]['compatibility'] == 'yes'
+
+def test_failed_at_first_offending(fail_on, cyclonedx_json):
+    returncode, report = fail_on('missing-license', cyclonedx_json)
+    assert returncode == 1
+    # the missing licenses are found without checking anything else
+    assert (report['checks'], report['checked']) == (6, 1)
+    assert [offending['dependency']['license'] for offending in report['offending']] == ['']
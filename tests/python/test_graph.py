@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from sbom_compliance_tool.compatibility import SBoMCompatibility
+from sbom_compliance_tool.graph import DependencyGraph
+
+def graph(edges):
+    dependency_graph = DependencyGraph()
+    for ref, dependencies in edges.items():
+        dependency_graph.add_node(ref, ref, '1.0', 'MIT')
+        for dependency_ref in dependencies:
+            dependency_graph.add_edge(ref, dependency_ref, 'library')
+    return dependency_graph
+
+def test_components_in_dependency_order():
+    components = graph({
+        'a': ['b', 'c'],
+        'b': ['c'],
+        'c': ['d'],
+        'd': ['c', 'e'],
+        'e': [],
+    }).components()
+    position = {ref: index for index, component in enumerate(components) for ref in component}
+    assert sorted(sorted(component) for component in components) == [['a'], ['b'], ['c', 'd'], ['e']]
+    assert position['e'] < position['c'] < position['b'] < position['a']
+
+def test_components_deep_graph():
+    depth = 10000
+    components = graph({f'n{index}': [f'n{index + 1}'] for index in range(depth)}).components()
+    assert len(components) == depth + 1
+    assert components[0] == [f'n{depth}']
+
+def test_transitive_same_as_brute_force(read_sbom, cyclonedx_json, checks, resources):
+    normalized_sbom = read_sbom(cyclonedx_json, {'dependency_graph': True})
+    dependency_graph = normalized_sbom['sbom']['graph']
+    if isinstance(dependency_graph, dict):
+        dependency_graph = DependencyGraph.from_dict(dependency_graph)
+    usecase, provisioning, modified = checks
+    compatibility = SBoMCompatibility()
+    transitive = compatibility.graph_compatibility(dependency_graph, provisioning, resources)
+
+    # the worst verdict of all edges reachable from each node
+    for ref in dependency_graph.nodes:
+        expected = None
+        for reached in dependency_graph.reachable(ref):
+            for dependency_ref, dependency_usecase in dependency_graph.dependencies(reached):
+                expected = compatibility.update_compat(expected, compatibility._edge_compatibility(dependency_graph.license(reached),
+                                                                                                   dependency_graph.license(dependency_ref),
+                                                                                                   dependency_usecase,
+                                                                                                   provisioning,
+                                                                                                   resources))
+        assert transitive[ref] == expected, ref
+    # bbb and fff depend on each other
+    assert transitive['bbb'] == transitive['fff']
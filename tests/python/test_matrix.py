@@ -0,0 +1,51 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from sbom_compliance_tool.compatibility import SBoMCompatibility
+from sbom_compliance_tool.matrix import CompatibilityMatrix
+
+USECASES = ['library', 'snippet', 'tool']
+
+def verdicts(report):
+    return [[dep['compatibility'] for dep in package['dependencies']] for package in report['packages']]
+
+@pytest.fixture(scope='module')
+def normalized_sbom(read_sbom, cyclonedx_json):
+    return read_sbom(cyclonedx_json)
+
+@pytest.fixture(scope='module')
+def matrix_file(normalized_sbom, checks, resources, tmp_path_factory):
+    compatibility = SBoMCompatibility()
+    usecase, provisioning, modified = checks
+    matrix = compatibility.build_matrix(sorted(compatibility.sbom_licenses(normalized_sbom)), USECASES, [provisioning], resources)
+    path = str(tmp_path_factory.mktemp('matrix') / 'matrix.bin')
+    matrix.save(path)
+    return path
+
+def test_matrix_hits_without_licomp(check_sbom, normalized_sbom, matrix_file):
+    matrix_report, compatibility = check_sbom(normalized_sbom, SBoMCompatibility(matrix=CompatibilityMatrix.load(matrix_file)))
+    assert compatibility.licomp_calls == 0
+    assert compatibility.matrix.misses == 0
+    assert verdicts(matrix_report) == verdicts(check_sbom(normalized_sbom)[0])
+
+    # repeated checks are found in the in-memory cache
+    hits = compatibility.matrix.hits
+    check_sbom(normalized_sbom, compatibility)
+    assert compatibility.matrix.hits == hits
+    assert compatibility.licomp_calls == 0
+
+def test_matrix_miss_uses_licomp(check_sbom, normalized_sbom, matrix_file):
+    matrix = CompatibilityMatrix.load(matrix_file)
+    report, compatibility = check_sbom(normalized_sbom, SBoMCompatibility(matrix=matrix), ['licomp_reclicense'])
+    assert matrix.hits == 0
+    assert compatibility.licomp_calls > 0
+
+def test_truncated_matrix(matrix_file, tmp_path):
+    truncated = tmp_path / 'truncated.bin'
+    with open(matrix_file, 'rb') as fp:
+        truncated.write_bytes(fp.read()[:-1])
+    with pytest.raises(Exception):
+        CompatibilityMatrix.load(str(truncated))
@@ -0,0 +1,19 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+def test_workers_counted(read_sbom, check_sbom, spdx_json):
+    normalized_sbom = read_sbom(spdx_json, {'spdx_all_packages': True})
+    serial_report, serial = check_sbom(normalized_sbom, jobs=1)
+    parallel_report, parallel = check_sbom(normalized_sbom, jobs=2)
+    parallel.close()
+    serial_stats = serial.cache_stats()
+    parallel_stats = parallel.cache_stats()
+
+    assert parallel_report == serial_report
+    assert 'workers' not in serial_stats
+    assert parallel_stats['workers'] >= 1
+    # each check is looked up in a cache, in the parent or in a worker
+    assert parallel_stats['hits'] + parallel_stats['misses'] == serial_stats['hits'] + serial_stats['misses']
+    assert parallel_stats['licomp_calls'] >= serial_stats['licomp_calls'] > 0
+    assert parallel_stats['licomp_calls'] == parallel_stats['misses']
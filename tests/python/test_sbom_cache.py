@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import os
+
+import pytest
+
+from sbom_compliance_tool.reader.sbom_reader import normalized_sbom_to_dict
+from sbom_compliance_tool.sbom_cache import NormalizedSBoMCache
+
+OPTIONS = {'dependency_graph': True, 'spdx_roots': None}
+
+@pytest.fixture(scope='module')
+def normalized_sbom(read_sbom, cyclonedx_json):
+    return read_sbom(cyclonedx_json, OPTIONS)
+
+def test_key(cyclonedx_json, tmp_path):
+    cache = NormalizedSBoMCache(str(tmp_path / 'cache'), '1.0', 1 << 20)
+    with open(cyclonedx_json, 'rb') as fp:
+        data = fp.read()
+    copy = tmp_path / 'copy.json'
+    copy.write_bytes(data)
+    changed = tmp_path / 'changed.json'
+    changed.write_bytes(data + b'\n')
+
+    key = cache.key(cyclonedx_json, OPTIONS)
+    # the content, not the path, is used
+    assert cache.key(str(copy), OPTIONS) == key
+    assert cache.data_key(data, OPTIONS) == cache.data_key(data.decode('utf-8'), OPTIONS) == key
+    assert cache.key(str(changed), OPTIONS) != key
+    # the reader options and the version are used, in any order
+    assert cache.key(cyclonedx_json, {'spdx_roots': None, 'dependency_graph': True}) == key
+    assert cache.key(cyclonedx_json, dict(OPTIONS, dependency_graph=False)) != key
+    assert NormalizedSBoMCache(str(tmp_path / 'cache'), '1.1', 1 << 20).key(cyclonedx_json, OPTIONS) != key
+
+def test_stored_as_json(normalized_sbom, tmp_path):
+    cache = NormalizedSBoMCache(str(tmp_path), '1.0', 1 << 20)
+    cache.put('a', normalized_sbom)
+    with open(tmp_path / 'a.json') as fp:
+        assert json.load(fp) == normalized_sbom_to_dict(normalized_sbom)
+
+    cached = cache.get('a')
+    assert normalized_sbom_to_dict(cached) == normalized_sbom_to_dict(normalized_sbom)
+    assert cached['sbom']['graph'].to_dict() == normalized_sbom['sbom']['graph'].to_dict()
+    assert cache.get('b') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_invalid_entries_removed(tmp_path):
+    (tmp_path / 'old.pickle').write_bytes(b'not read')
+    (tmp_path / 'a.json').write_text('not JSON')
+    cache = NormalizedSBoMCache(str(tmp_path), '1.0', 1 << 20)
+    assert not (tmp_path / 'old.pickle').exists()
+    assert cache.get('a') is None
+    assert not (tmp_path / 'a.json').exists()
+
+def test_least_recently_used_evicted(normalized_sbom, tmp_path):
+    size = len(json.dumps(normalized_sbom_to_dict(normalized_sbom), separators=(',', ':')))
+    cache = NormalizedSBoMCache(str(tmp_path), '1.0', 2 * size)
+    cache.put('a', normalized_sbom)
+    cache.put('b', normalized_sbom)
+    os.utime(tmp_path / 'a.json', (1000, 1000))
+    os.utime(tmp_path / 'b.json', (2000, 2000))
+    # a is now used more recently than b
+    assert cache.get('a')
+    cache.put('c', normalized_sbom)
+
+    assert sorted(os.listdir(tmp_path)) == ['a.json', 'c.json']
+    assert cache.stats()['evictions'] == 1
@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from sbom_compliance_tool.compatibility import SBoMCompatibility
+from sbom_compliance_tool.compliance_tool import SBoMComplianceTool
+from sbom_compliance_tool.config import sbom_compliance_tool_version
+from sbom_compliance_tool.server import SBoMComplianceServer
+
+@pytest.fixture(scope='module')
+def server(resources, checks):
+    """The server, on a free port, serving in a thread of its own"""
+    compliance_server = SBoMComplianceServer(SBoMComplianceTool(), SBoMCompatibility(), resources, *checks)
+    http_server = compliance_server.http_server('127.0.0.1', 0)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield compliance_server, f'http://127.0.0.1:{http_server.server_port}'
+    http_server.shutdown()
+    http_server.server_close()
+
+def request(url, data=None):
+    try:
+        with urllib.request.urlopen(url, data=data) as response:
+            return response.status, response.headers['Content-Type'], response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers['Content-Type'], e.read()
+
+def test_health(server):
+    status, content_type, body = request(f'{server[1]}/health')
+    assert status == 200
+    assert content_type == 'application/json'
+    assert json.loads(body) == {'status': 'ok', 'version': sbom_compliance_tool_version}
+
+def test_verify(server, cyclonedx_json):
+    compliance_server, url = server
+    with open(cyclonedx_json, 'rb') as fp:
+        data = fp.read()
+    status, content_type, body = request(f'{url}/verify', data)
+    assert status == 200
+    assert content_type == 'application/json'
+    assert json.loads(body) == json.loads(json.dumps(compliance_server.verify(data)))
+
+def test_verify_invalid(server):
+    status, content_type, body = request(f'{server[1]}/verify', b'not an SBoM')
+    assert status == 400
+    assert 'error' in json.loads(body)
+
+def test_unknown_path(server):
+    status, content_type, body = request(f'{server[1]}/unknown')
+    assert status == 404
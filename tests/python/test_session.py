@@ -0,0 +1,44 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from sbom_compliance_tool.session import VerificationSession
+
+LICENSES = ['MIT', 'Apache-2.0', 'BSD-3-Clause', 'GPL-2.0-only', 'GPL-3.0-or-later', 'LGPL-2.1-or-later', 'MPL-2.0', 'Zlib']
+THREADS = 15
+
+def sboms(cyclonedx_json):
+    """Variants of the example SBoM, with the licenses of the
+    components rotated"""
+    with open(cyclonedx_json) as fp:
+        sbom = json.load(fp)
+    variants = []
+    for index in range(len(LICENSES)):
+        for component_index, component in enumerate(sbom['components']):
+            component['licenses'] = [{'license': {'id': LICENSES[(index + component_index) % len(LICENSES)]}}]
+        variants.append(json.dumps(sbom).encode('utf-8'))
+    return variants
+
+def test_concurrent_verifications(cyclonedx_json, resources):
+    data = sboms(cyclonedx_json) * 3
+    session = VerificationSession(resources)
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        reports = list(executor.map(session.verify_data, data))
+
+    serial = VerificationSession(resources)
+    assert reports == [serial.verify_data(sbom) for sbom in data]
+
+    # each license is identified once and each check made once
+    stats = session.compatibility.cache_stats()
+    assert stats['flame_calls'] == serial.compatibility.cache_stats()['flame_calls']
+    assert stats['licomp_calls'] == stats['size'] == serial.compatibility.cache_stats()['licomp_calls']
+
+def test_concurrent_files(cyclonedx_json, resources):
+    session = VerificationSession(resources)
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        reports = list(executor.map(session.verify_file, [cyclonedx_json] * THREADS))
+    assert all(report == reports[0] for report in reports)
+    assert session.compatibility.cache_stats()['licomp_calls'] == session.compatibility.cache_stats()['size']
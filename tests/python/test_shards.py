@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+
+import pytest
+
+from sbom_compliance_tool.format import INDEX_FILE
+from sbom_compliance_tool.format import SBoMReportFormatterFactory
+
+@pytest.fixture(scope='module')
+def packages(read_sbom, check_sbom, cyclonedx_json):
+    """The package report of the example SBoM (6 dependencies) and a
+    copy of it without dependencies"""
+    package = check_sbom(read_sbom(cyclonedx_json))[0]['packages'][0]
+    return [package, dict(package, name='No deps/here', dependencies=[])]
+
+def write_sharded(packages, output_dir, shard_size):
+    formatter = SBoMReportFormatterFactory.formatter('markdown')
+    index_path = formatter.write_sharded(iter(packages), str(output_dir), shard_size)
+    with open(index_path) as fp:
+        return index_path, fp.read()
+
+@pytest.mark.parametrize('shard_size, parts', [(0, 1), (1, 6), (4, 2), (6, 1), (10, 1)])
+def test_shards(packages, tmp_path, shard_size, parts):
+    index_path, index = write_sharded(packages, tmp_path, shard_size)
+    assert index_path == str(tmp_path / INDEX_FILE)
+
+    name = packages[0]['name'].replace(' ', '_')
+    files = [f'00001-{name}.md'] + [f'00001-{name}-{part}.md' for part in range(2, parts + 1)]
+    assert sorted(os.listdir(tmp_path)) == sorted(files + ['00002-No_deps_here.md', INDEX_FILE])
+
+    # each dependency is in one file
+    dependencies = 0
+    for file_name in files:
+        with open(tmp_path / file_name) as fp:
+            dependencies += sum(1 for line in fp if line.startswith('##### '))
+    assert dependencies == 6
+
+    assert '* packages: 2' in index
+    assert '* dependencies: 6' in index
+    assert f'* [{packages[0]["name"]} {packages[0]["version"]}]({files[0]}): {packages[0]["compatibility"]}, 6 dependencies' in index
+    for part, file_name in enumerate(files[1:], 2):
+        assert f'    * [part {part}]({file_name})' in index
+    assert '(00002-No_deps_here.md)' in index
+
+def test_negative_shard_size(run_tool, packages, cyclonedx_json, tmp_path):
+    with pytest.raises(Exception):
+        write_sharded(packages, tmp_path, -1)
+    result = run_tool(['verify', '--output-dir', str(tmp_path), '--shard-size', '-1', cyclonedx_json],
+                      capture_output=True, text=True)
+    assert result.returncode == 2
+    assert 'must be 0 or more' in result.stderr
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from sbom_compliance_tool.license_texts import LicenseTextLookup
+from sbom_compliance_tool.reader.sbom_reader import normalized_sbom_to_dict
+from sbom_compliance_tool.reader.spdx import SPDXSBoMReader
+
+SPDX_FILES = ['example-project.spdx.json', 'example-project.spdx']
+OPTIONS = [
+    {},
+    {'spdx_all_packages': True},
+    {'dependency_graph': True},
+    {'spdx_roots': ['SPDXRef-aaa']},
+]
+
+# shared by the tests, the extracted license text is looked up once
+LICENSE_TEXTS = LicenseTextLookup()
+
+def normalize(file_path, options):
+    reader = SPDXSBoMReader(dict(options, license_texts=LICENSE_TEXTS))
+    reader.normalize_sbom_file(file_path)
+    return normalized_sbom_to_dict(reader.normalized_sbom())
+
+@pytest.mark.parametrize('file_name', SPDX_FILES)
+@pytest.mark.parametrize('options', OPTIONS)
+def test_fast_reader_same_as_spdx_tools(example, file_name, options):
+    assert normalize(example(file_name), dict(options, fast_spdx=True)) == normalize(example(file_name), options)
+
+@pytest.mark.parametrize('file_name', SPDX_FILES)
+@pytest.mark.parametrize('fast_spdx', [False, True])
+def test_file_without_license(example, file_name, fast_spdx):
+    normalized = normalize(example(file_name), {'fast_spdx': fast_spdx})
+    dependencies = {dep['name']: dep for dep in normalized['sbom']['packages'][0]['dependencies']}
+    assert dependencies['./src/main.c']['license'] == 'GPL-3.0-or-later'
+    assert dependencies['./src/util.c']['license'] == ''
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from sbom_compliance_tool.cache import CompatibilityCache
+from sbom_compliance_tool.store import CompatibilityStore
+
+KEY = CompatibilityCache.compatibility_key('MIT', 'Apache-2.0', 'library', 'binary-distribution', ['licomp_osadl'])
+VERDICT = {
+    'compatibility': 'yes',
+    'resources': ['licomp_osadl'],
+}
+
+def test_stored_between_runs(tmp_path):
+    path = str(tmp_path / 'compatibility.sqlite')
+    store = CompatibilityStore(path, 'version-1')
+    assert store.get(KEY) is None
+    store.put(KEY, VERDICT)
+    store.close()
+
+    store = CompatibilityStore(path, 'version-1')
+    assert store.get(KEY) == VERDICT
+    assert store.stats()['hits'] == 1
+
+def test_cleared_for_other_version(tmp_path):
+    path = str(tmp_path / 'compatibility.sqlite')
+    store = CompatibilityStore(path, 'version-1')
+    store.put(KEY, VERDICT)
+    store.close()
+
+    store = CompatibilityStore(path, 'version-2')
+    assert store.get(KEY) is None
+
+def test_clear(tmp_path):
+    store = CompatibilityStore(str(tmp_path / 'compatibility.sqlite'), 'version-1')
+    store.put(KEY, VERDICT)
+    store.clear()
+    assert store.get(KEY) is None
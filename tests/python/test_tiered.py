@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2025 Henrik Sandklef
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from sbom_compliance_tool import compatibility as compatibility_module
+from sbom_compliance_tool.compatibility import SBoMCompatibility
+
+TIERS = {
+    ('a', 'b', 'c'): ['b', 'a', 'c'],
+}
+
+def tiered(verdicts, tiers=TIERS):
+    """SBoMCompatibility with the resources in tiers, where licomp
+    returns verdicts[resource]"""
+    compatibility = SBoMCompatibility(tiered=True, tiers=tiers)
+    compatibility.consulted = []
+
+    def licomp_compatibility(outbound, inbound, usecase, provisioning, resources):
+        compatibility.consulted.append(resources[0])
+        return {
+            'compatibility': verdicts[resources[0]],
+            'resources': resources,
+        }
+    compatibility._licomp_compatibility = licomp_compatibility
+    return compatibility
+
+def check(compatibility):
+    return compatibility._check_compatibility('MIT', 'GPL-2.0-only', 'library', 'binary-distribution', ['c', 'a', 'b'])
+
+def test_first_tier_decides():
+    compatibility = tiered({'a': 'no', 'b': 'yes', 'c': 'no'})
+    compat = check(compatibility)
+    assert compat['compatibility'] == 'yes'
+    assert compat['tier'] == {'tier': 1, 'resource': 'b', 'consulted': ['b']}
+    assert compatibility.consulted == ['b']
+    assert compatibility.tier_decisions == {'b': 1}
+
+@pytest.mark.parametrize('undecided', ['unsupported', 'depends'])
+def test_undecided_goes_to_next_tier(undecided):
+    compatibility = tiered({'a': 'no', 'b': undecided, 'c': 'yes'})
+    compat = check(compatibility)
+    assert compat['compatibility'] == 'no'
+    assert compat['tier'] == {'tier': 2, 'resource': 'a', 'consulted': ['b', 'a']}
+
+def test_undecided_prefers_depends():
+    compat = check(tiered({'a': 'depends', 'b': 'unsupported', 'c': 'unsupported'}))
+    assert compat['compatibility'] == 'depends'
+    assert compat['resources'] == ['a']
+    assert compat['tier'] == {'tier': None, 'resource': None, 'consulted': ['b', 'a', 'c']}
+
+def test_all_unsupported():
+    compatibility = tiered({'a': 'unsupported', 'b': 'unsupported', 'c': 'unsupported'})
+    compat = check(compatibility)
+    assert compat['compatibility'] == 'unsupported'
+    assert compat['tier']['resource'] is None
+    assert compatibility.tier_decisions == {None: 1}
+
+def test_checked_once():
+    compatibility = tiered({'a': 'no', 'b': 'yes', 'c': 'no'})
+    check(compatibility)
+    check(compatibility)
+    assert compatibility.consulted == ['b']
+
+def test_key_has_tier_order():
+    verdicts = {'a': 'yes', 'b': 'yes', 'c': 'yes'}
+    key_args = ('MIT', 'MIT', 'library', 'binary-distribution', ['a', 'b', 'c'])
+    key = tiered(verdicts)._compatibility_key(*key_args)
+    other_key = tiered(verdicts, {('a', 'b', 'c'): ['a', 'b', 'c']})._compatibility_key(*key_args)
+    assert key != other_key
+
+def test_workers_use_given_tiers():
+    compatibility_module._init_worker(16, None, None, None, True, TIERS)
+    worker = compatibility_module._worker_compatibility
+    worker._licomp_compatibility = None
+    # no probing, the order is the one from the parent
+    assert worker._resource_tiers(['c', 'b', 'a'], 'library', 'binary-distribution') == ['b', 'a', 'c']